@@ -1,3 +1,4 @@
+from .aio import AsyncReddit2Text
 from .main import Reddit2Text
 
-__all__ = ["Reddit2Text"]
+__all__ = ["AsyncReddit2Text", "Reddit2Text"]
@@ -0,0 +1,189 @@
+"""asyncio front end for Reddit2Text, built on asyncpraw."""
+
+import asyncio
+from typing import Any, List, NoReturn, Union
+
+from reddit2text.expand import drop_deep_stubs
+from reddit2text.main import OutputFile, Reddit2Text
+from reddit2text.models import BatchResult, PostData
+
+try:
+    import asyncpraw
+except ImportError:  # pragma: no cover - exercised only without the extra
+    asyncpraw = None  # type: ignore[assignment]
+
+# Reddit2Text options that rely on the sync praw session or pipeline
+_UNSUPPORTED = (
+    "cache_dir",
+    "credentials",
+    "rate_limiter",
+    "thread_cache_size",
+    "on_stats",
+    "collect_stats",
+    # asyncpraw's replace_more cannot stop at a comment count
+    "max_comments",
+)
+
+
+def _sync_only(name: str, instead: str) -> NoReturn:
+    raise TypeError(f"AsyncReddit2Text.{name} is not available; use {instead}")
+
+
+class AsyncReddit2Text(Reddit2Text):
+    """
+    Reddit2Text with coroutine entry points for use inside an event loop.
+
+    Takes the same arguments as Reddit2Text, plus ``max_concurrency`` to
+    cap how many threads are fetched at once. Requires the ``async``
+    extra: ``pip install reddit2text[async]``.
+
+    Use it as an async context manager (or call ``aclose``) so the
+    underlying HTTP session is released. The blocking methods of
+    Reddit2Text raise TypeError, and the options that need the sync
+    session (cache_dir, credentials, rate_limiter, thread_cache_size,
+    on_stats, collect_stats), and max_comments, are rejected.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        max_concurrency: int = 8,
+        **kwargs: Any,
+    ) -> None:
+        if asyncpraw is None:
+            raise ImportError(
+                "AsyncReddit2Text requires asyncpraw: "
+                "pip install reddit2text[async]"
+            )
+        for option in _UNSUPPORTED:
+            if kwargs.get(option):
+                raise ValueError(f"AsyncReddit2Text does not support {option}")
+        self.max_concurrency = max_concurrency
+        super().__init__(*args, **kwargs)
+        if self.engine != "praw":
+            raise ValueError("AsyncReddit2Text only supports engine='praw'")
+
+    def _make_reddit(self) -> Any:
+        return asyncpraw.Reddit(
+            client_id=self.client_id,
+            client_secret=self.client_secret,
+            user_agent=self.user_agent,
+        )
+
+    def textualize_post(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _sync_only("textualize_post", "await atextualize_post(...)")
+
+    def textualize_batch(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _sync_only("textualize_batch", "await atextualize_batch(...)")
+
+    def textualize_subreddit(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _sync_only("textualize_subreddit", "await atextualize_batch(urls)")
+
+    def iter_textualize(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _sync_only("iter_textualize", "await atextualize_post(url)")
+
+    def textualize_to(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _sync_only("textualize_to", "await atextualize_post(url)")
+
+    def refresh(self, *args: Any, **kwargs: Any) -> NoReturn:
+        _sync_only("refresh", "Reddit2Text.refresh")
+
+    async def aclose(self) -> None:
+        await self._praw_reddit.close()
+
+    async def __aenter__(self) -> "AsyncReddit2Text":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _aprocess_original_post(self, thread: Any) -> PostData:
+        post_data = self._build_post_data(thread)
+
+        # Ensure all comments are fetched, within max_expand_requests and
+        # expand_timeout_s
+        if self.max_comment_depth != 0:
+            depth_limit = self._depth_limit()
+            if depth_limit:
+                # Stubs where Reddit cut the tree would each cost a
+                # request for comments that are then discarded
+                drop_deep_stubs(
+                    thread.comments,
+                    depth_limit,
+                    (asyncpraw.models.MoreComments,),
+                )
+            try:
+                async with asyncio.timeout(self.expand_timeout_s):
+                    skipped = await thread.comments.replace_more(
+                        limit=self.max_expand_requests
+                    )
+            except TimeoutError:
+                # Stubs left unresolved are skipped when rendering
+                skipped = True
+            if skipped:
+                post_data["incomplete"] = True
+
+        return post_data
+
+    async def _atextualize_one(
+        self, url: str, semaphore: asyncio.Semaphore
+    ) -> tuple[str, List[OutputFile]]:
+        async with semaphore:
+            depth_limit = self._depth_limit()
+            if depth_limit:
+                # Have Reddit prune the tree instead of discarding it locally
+                thread = await self._praw_reddit.submission(
+                    url=url, fetch=False
+                )
+                thread.add_fetch_param("depth", depth_limit)
+                await thread.load()
+            else:
+                thread = await self._praw_reddit.submission(url=url)
+            pd = await self._aprocess_original_post(thread)
+        # Rendering is pure CPU work on the already-fetched tree
+        return self._render_thread(thread, pd)
+
+    async def _arun_batch(
+        self, urls: List[str]
+    ) -> List[Union[tuple[str, List[OutputFile]], BaseException]]:
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        return await asyncio.gather(
+            *(self._atextualize_one(url, semaphore) for url in urls),
+            return_exceptions=True,
+        )
+
+    async def atextualize_post(
+        self, urls: Union[str, List[str]]
+    ) -> Union[str, List[str]]:
+        """Async counterpart of textualize_post."""
+        if isinstance(urls, str):
+            urls = [urls]
+
+        final_outputs = []
+        written: set[str] = set()
+
+        for result in await self._arun_batch(urls):
+            if isinstance(result, BaseException):
+                raise result
+            final_output, files = result
+            self._write_files(files, written)
+            final_outputs.append(final_output)
+
+        if len(final_outputs) == 1:
+            return final_outputs[0]
+        return final_outputs
+
+    async def atextualize_batch(self, urls: List[str]) -> List[BatchResult]:
+        """Async counterpart of textualize_batch."""
+        results: List[BatchResult] = []
+        written: set[str] = set()
+        for url, result in zip(urls, await self._arun_batch(urls)):
+            if isinstance(result, Exception):
+                results.append({"url": url, "output": None, "error": result})
+                continue
+            if isinstance(result, BaseException):
+                raise result
+            final_output, files = result
+            self._write_files(files, written)
+            results.append({"url": url, "output": final_output, "error": None})
+        return results
@@ -0,0 +1,287 @@
+"""
+Caches: an on-disk cache of Reddit API responses for comment trees, and
+an in-memory LRU of fetched threads.
+
+The disk cache stores only the responses that make up a thread: the
+submission listing, /api/morechildren batches and "continue this thread"
+listings. Entries are JSON files named after the submission they belong
+to, so one directory can be shared by several processes: files are
+written atomically (temp file + rename), readers never see partial
+entries, and eviction tolerates files removed by another process.
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import praw
+from praw.const import API_PATH
+
+from reddit2text.models import CommentTable, PostData
+
+_SUBMISSION_PATH_RE = re.compile(r"^comments/([a-z0-9]+)/")
+
+
+def _submission_id(path: str, data: Any) -> Optional[str]:
+    """The submission a cacheable request belongs to, else None."""
+    match = _SUBMISSION_PATH_RE.match(path)
+    if match:
+        return match.group(1)
+    if path == API_PATH["morechildren"] and isinstance(data, dict):
+        link_id = str(data.get("link_id", ""))
+        if link_id.startswith("t3_"):
+            return link_id[3:]
+    return None
+
+
+def _is_archived(response: Any) -> bool:
+    """Whether a submission listing response is for an archived post."""
+    try:
+        post = response[0]["data"]["children"][0]["data"]
+    except (IndexError, KeyError, TypeError):
+        return False
+    return bool(post.get("archived"))
+
+
+class ResponseCache:
+    """
+    Directory of cached responses with a TTL and a total size bound.
+
+    ``ttl_s`` is how long an entry stays fresh (None for forever); entries
+    of archived posts never expire, since those threads can no longer
+    change. When the directory grows past ``max_bytes``, the least
+    recently used entries are removed. Reads refresh an entry's mtime,
+    which is what the LRU order is based on.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ttl_s: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        self.directory = directory
+        self.ttl_s = ttl_s
+        self.max_bytes = max_bytes
+        # Bytes on disk as last seen by this process; rescanned on eviction
+        # to pick up entries written by others
+        self._size: Optional[int] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, submission_id: str, key: str) -> str:
+        return os.path.join(self.directory, f"{submission_id}-{key}.json")
+
+    def _archived_marker(self, submission_id: str) -> str:
+        return os.path.join(self.directory, f"{submission_id}.archived")
+
+    @staticmethod
+    def key(method: str, path: str, params: Any, data: Any) -> str:
+        # The raw engine names the response format that PRAW leaves to
+        # prawcore; drop it so both engines share entries
+        if isinstance(data, dict):
+            data = {k: v for k, v in data.items() if k != "api_type"}
+        blob = json.dumps([method, path, params, data], sort_keys=True)
+        return hashlib.sha1(blob.encode()).hexdigest()
+
+    def get(self, submission_id: str, key: str) -> Any:
+        """The cached response, or None on a miss or expired entry."""
+        path = self._path(submission_id, key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            self.ttl_s is not None
+            and time.time() - entry["fetched_at"] > self.ttl_s
+            and not os.path.exists(self._archived_marker(submission_id))
+        ):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry["response"]
+
+    def put(self, submission_id: str, key: str, response: Any) -> None:
+        if _is_archived(response):
+            with open(self._archived_marker(submission_id), "w"):
+                pass
+        blob = json.dumps({"fetched_at": time.time(), "response": response})
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(blob)
+            os.replace(tmp, self._path(submission_id, key))
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        if self.max_bytes is not None:
+            if self._size is None:
+                self._size = self._scan()[1]
+            else:
+                self._size += len(blob)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _scan(self) -> tuple[list[tuple[float, int, str]], int]:
+        """(mtime, size, path) of every entry, and their total size."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for item in it:
+                if not item.name.endswith(".json"):
+                    continue
+                try:
+                    st = item.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, item.path))
+                total += st.st_size
+        return entries, total
+
+    def _evict(self) -> None:
+        assert self.max_bytes is not None
+        entries, total = self._scan()
+        entries.sort()
+        # Evict down to 90% so the next few writes do not rescan
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # removed by another process
+            total -= size
+        self._size = total
+
+
+class CachedReddit(praw.Reddit):
+    """praw.Reddit that answers comment-tree requests from a ResponseCache."""
+
+    def __init__(self, cache: ResponseCache, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.response_cache = cache
+
+    def request(
+        self,
+        *,
+        data: Any = None,
+        files: Any = None,
+        json: Any = None,
+        method: str,
+        params: Any = None,
+        path: str,
+    ) -> Any:
+        submission_id = _submission_id(path, data)
+        if submission_id is None or files or json:
+            return super().request(
+                data=data,
+                files=files,
+                json=json,
+                method=method,
+                params=params,
+                path=path,
+            )
+        key = ResponseCache.key(method, path, params, data)
+        response = self.response_cache.get(submission_id, key)
+        if response is None:
+            response = super().request(
+                data=data, method=method, params=params, path=path
+            )
+            self.response_cache.put(submission_id, key, response)
+        return response
+
+
+# (post_id, post data, comment table)
+ThreadEntry = tuple[str, PostData, CommentTable]
+
+
+class ThreadCache:
+    """
+    Thread-safe LRU of expanded threads, bounded by entry count and
+    optionally by the total number of comments held.
+
+    Keys are tuples whose first item is the submission ID, so every
+    variant of a thread (e.g. different depths) can be invalidated at once.
+    Loads of one key are serialized with ``loading`` so that concurrent
+    requests for the same thread fetch it once.
+    """
+
+    def __init__(
+        self, max_entries: int, max_comments: Optional[int] = None
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_comments = max_comments
+        self._entries: OrderedDict[tuple[Any, ...], ThreadEntry] = (
+            OrderedDict()
+        )
+        self._comments = 0
+        self._lock = threading.Lock()
+        # Per-key load lock and the number of threads holding or awaiting it
+        self._loading: Dict[tuple[Any, ...], tuple[threading.Lock, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple[Any, ...]) -> Optional[ThreadEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    @contextmanager
+    def loading(self, key: tuple[Any, ...]) -> Iterator[None]:
+        """Hold ``key``'s load lock; check the cache again once inside."""
+        with self._lock:
+            lock, users = self._loading.get(key, (threading.Lock(), 0))
+            self._loading[key] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                users = self._loading[key][1] - 1
+                if users:
+                    self._loading[key] = (lock, users)
+                else:
+                    del self._loading[key]
+
+    def put(self, key: tuple[Any, ...], entry: ThreadEntry) -> None:
+        size = len(entry[2])
+        if self.max_comments is not None and size > self.max_comments:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._comments -= len(old[2])
+            self._entries[key] = entry
+            self._comments += size
+            while len(self._entries) > self.max_entries or (
+                self.max_comments is not None
+                and self._comments > self.max_comments
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._comments -= len(evicted[2])
+
+    def invalidate(self, submission_id: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == submission_id]:
+                self._comments -= len(self._entries.pop(key)[2])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._comments = 0
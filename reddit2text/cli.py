@@ -0,0 +1,245 @@
+"""
+``reddit2text`` command: render a list of thread URLs to files.
+
+URLs are read one per line from a file or stdin (blank lines and lines
+starting with ``#`` are skipped) and dealt round-robin to worker
+processes, each with its own Reddit2Text client and connection. Every
+thread is written to the ``--output`` template, e.g.
+``out/{id}.{ext}``. With ``--manifest`` each finished URL is recorded
+and a re-run skips the ones already done. Throughput stats go to
+stderr at the end.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, TextIO
+
+import praw
+
+from reddit2text.main import _EXTENSIONS, Reddit2Text
+from reddit2text.manifest import Manifest
+
+
+@dataclass
+class ShardStats:
+    """What one worker process got through."""
+
+    threads: int = 0
+    comments: int = 0
+    requests: int = 0
+    # (index, url, error message) for every URL that failed
+    failed: List[tuple[int, str, str]] = field(default_factory=list)
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="reddit2text",
+        description="Render Reddit threads to text files.",
+    )
+    parser.add_argument(
+        "urls",
+        nargs="?",
+        default="-",
+        help="file with one thread URL per line (default: stdin)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default="{id}.{ext}",
+        help=(
+            "output path template; {id} is the submission ID, {index} the "
+            "URL's position in the list (from 0, not counting blank and "
+            "comment lines), {ext} the format's extension "
+            "(default: %(default)s)"
+        ),
+    )
+    parser.add_argument(
+        "-f", "--format", choices=list(_EXTENSIONS), default="txt"
+    )
+    parser.add_argument(
+        "-p",
+        "--processes",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker processes (default: CPU count)",
+    )
+    parser.add_argument(
+        "-w",
+        "--max-workers",
+        type=int,
+        default=None,
+        help="threads fetched concurrently within each process",
+    )
+    parser.add_argument("--max-comment-depth", type=int, default=None)
+    parser.add_argument("--engine", choices=["praw", "json"], default="praw")
+    parser.add_argument("--cache-dir", default=None)
+    parser.add_argument(
+        "--credentials",
+        default=None,
+        help=(
+            "JSON file with a list of {client_id, client_secret, "
+            "user_agent} apps, dealt out across the processes (default: "
+            "REDDIT_* environment variables)"
+        ),
+    )
+    parser.add_argument(
+        "--manifest",
+        default=None,
+        help=(
+            "record each URL's status, files and content hash here; "
+            "re-running with it skips finished URLs and retries failures"
+        ),
+    )
+    return parser
+
+
+def _read_urls(source: TextIO) -> List[str]:
+    return [
+        line.strip()
+        for line in source
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+
+
+def _output_path(template: str, index: int, url: str, ext: str) -> str:
+    try:
+        post_id = praw.models.Submission.id_from_url(url)
+    except praw.exceptions.InvalidURL:
+        post_id = str(index)  # fails to fetch anyway
+    return template.format(id=post_id, index=index, ext=ext)
+
+
+def _run_shard(
+    settings: Dict[str, Any],
+    template: str,
+    shard: List[tuple[int, str]],
+    manifest: Optional[str] = None,
+) -> ShardStats:
+    """Render one process's share of the URLs."""
+    r2t = Reddit2Text(**settings, collect_stats=True)
+    ext = _EXTENSIONS[settings["format"]]
+    urls = [url for _, url in shard]
+    paths: List[Optional[str]] = []
+    for index, url in shard:
+        path = _output_path(template, index, url, ext)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        paths.append(path)
+    results = r2t.textualize_batch(urls, manifest=manifest, save_paths=paths)
+    stats = ShardStats()
+    for (index, url), result in zip(shard, results):
+        error = result["error"]
+        if error is not None:
+            message = f"{type(error).__name__}: {error}"
+            stats.failed.append((index, url, message))
+        elif not result.get("skipped"):
+            stats.threads += 1
+    if r2t.batch_stats is not None:
+        stats.comments = r2t.batch_stats["comments"]
+        stats.requests = r2t.batch_stats["requests"]
+    return stats
+
+
+def _shard_settings(
+    settings: Dict[str, Any],
+    credentials: Optional[List[Dict[str, str]]],
+    shard: int,
+    n_shards: int,
+) -> Dict[str, Any]:
+    """
+    Settings for one process. With at least one app per process each
+    process gets its own apps, so no two share a rate-limit quota.
+    """
+    if not credentials:
+        return settings
+    if len(credentials) >= n_shards:
+        credentials = credentials[shard::n_shards]
+    return {**settings, "credentials": credentials}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _parser().parse_args(argv)
+    if args.format != "sqlite" and not (
+        "{id}" in args.output or "{index}" in args.output
+    ):
+        # Processes would overwrite each other's files
+        print(
+            "reddit2text: --output must contain {id} or {index}",
+            file=sys.stderr,
+        )
+        return 2
+
+    if args.urls == "-":
+        urls = _read_urls(sys.stdin)
+    else:
+        with open(args.urls) as f:
+            urls = _read_urls(f)
+    credentials = None
+    if args.credentials:
+        with open(args.credentials) as f:
+            credentials = json.load(f)
+
+    # Indexes are taken before filtering so {index} stays stable on resume
+    todo = list(enumerate(urls))
+    if args.manifest:
+        with Manifest(args.manifest) as done:
+            todo = [(i, url) for i, url in todo if not done.is_done(url)]
+    skipped = len(urls) - len(todo)
+
+    settings: Dict[str, Any] = {
+        "format": args.format,
+        "max_workers": args.max_workers,
+        "max_comment_depth": args.max_comment_depth,
+        "engine": args.engine,
+        "cache_dir": args.cache_dir,
+    }
+    n = max(1, min(args.processes, len(todo)))
+    shards = [todo[i::n] for i in range(n)]
+    shard_settings = [
+        _shard_settings(settings, credentials, i, n) for i in range(n)
+    ]
+
+    start = time.perf_counter()
+    if n == 1:
+        results = [
+            _run_shard(
+                shard_settings[0], args.output, shards[0], args.manifest
+            )
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=n) as pool:
+            results = list(
+                pool.map(
+                    _run_shard,
+                    shard_settings,
+                    [args.output] * n,
+                    shards,
+                    [args.manifest] * n,
+                )
+            )
+    elapsed = time.perf_counter() - start
+
+    threads = sum(s.threads for s in results)
+    comments = sum(s.comments for s in results)
+    requests = sum(s.requests for s in results)
+    failed = sorted(f for s in results for f in s.failed)
+    for _, url, error in failed:
+        print(f"failed: {url}: {error}", file=sys.stderr)
+    per_s = 1 / elapsed if elapsed > 0 else 0.0
+    print(
+        f"{threads} threads ({len(failed)} failed, {skipped} already "
+        f"done), {comments} comments, "
+        f"{requests} requests in {elapsed:.1f}s with {n} processes: "
+        f"{threads * per_s:.2f} threads/s, {comments * per_s:.1f} "
+        f"comments/s",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+"""Batched, concurrent replacement of MoreComments stubs in a comment tree."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Collection, Iterator, List, Optional
+
+import praw
+from praw.const import API_PATH
+
+from reddit2text import metrics, raw
+from reddit2text.ratelimit import in_context
+
+# Maximum number of comment IDs /api/morechildren accepts per request
+MORECHILDREN_MAX_IDS = 100
+
+_STUB_TYPES = (praw.models.MoreComments, raw.RawMore)
+
+
+def _adopt(item: Any, submission: Any) -> None:
+    """Register a fetched PRAW object with its submission."""
+    if not isinstance(submission, raw.RawSubmission):
+        item.submission = submission
+
+
+def _replies_list(node: Any) -> List[Any]:
+    """The mutable list backing a comment's replies (or a forest)."""
+    replies = node.replies if hasattr(node, "replies") else node
+    backing: List[Any] = getattr(replies, "_comments", replies)
+    return backing
+
+
+def _gather_stubs(
+    forest: List[Any],
+    stub_types: tuple[type, ...] = _STUB_TYPES,
+) -> tuple[List[tuple[List[Any], Any, int]], dict[str, Any]]:
+    """
+    Walk the tree once, returning every MoreComments stub together with
+    the list that holds it and the depth its comments would sit at
+    (top-level = 1), and a fullname -> comment index.
+    """
+    stubs: List[tuple[List[Any], Any, int]] = []
+    by_name: dict[str, Any] = {}
+    queue: List[tuple[List[Any], int]] = [(forest, 1)]
+    while queue:
+        container, depth = queue.pop()
+        for item in container:
+            if isinstance(item, stub_types):
+                stubs.append((container, item, depth))
+            else:
+                by_name[f"t1_{item.id}"] = item
+                queue.append((_replies_list(item), depth + 1))
+    return stubs, by_name
+
+
+def _expired(deadline: Optional[float]) -> bool:
+    return deadline is not None and time.monotonic() >= deadline
+
+
+def _fetch_morechildren(
+    reddit: Any,
+    submission: Any,
+    ids: List[str],
+    lock: threading.Lock,
+    deadline: Optional[float],
+    depth: Optional[int],
+) -> Optional[List[Any]]:
+    data = {
+        "children": ",".join(ids),
+        "link_id": submission.fullname,
+        "sort": submission.comment_sort,
+    }
+    if depth is not None:
+        data["depth"] = str(depth)
+    # Reddit rejects concurrent calls to this endpoint from one client
+    with lock:
+        if _expired(deadline):
+            return None
+        if isinstance(submission, raw.RawSubmission):
+            return raw.fetch_morechildren(reddit, submission, ids, depth)
+        return list(reddit.post(API_PATH["morechildren"], data=data))
+
+
+def _fetch_continuation(
+    reddit: Any,
+    submission: Any,
+    stub: Any,
+    deadline: Optional[float],
+    depth: Optional[int],
+) -> Optional[List[Any]]:
+    """Resolve a "continue this thread" stub (count 0, no children)."""
+    if _expired(deadline):
+        return None
+    comment_id = stub.parent_id.split("_", 1)[1]
+    if isinstance(submission, raw.RawSubmission):
+        return raw.fetch_continuation(
+            reddit,
+            submission,
+            comment_id,
+            None if depth is None else depth + 1,
+        )
+    path = f"{API_PATH['submission'].format(id=submission.id)}_/{comment_id}"
+    params: dict[str, Any] = {
+        "limit": submission.comment_limit,
+        "sort": submission.comment_sort,
+    }
+    if depth is not None:
+        # The response is rooted at the parent comment, one level up
+        params["depth"] = depth + 1
+    _, comments = reddit.get(path, params=params)
+    if not comments.children:
+        return []
+    return list(comments.children[0].replies)
+
+
+def _levels_left(max_depth: Optional[int], depth: int) -> Optional[int]:
+    """Levels still wanted below (and including) ``depth``."""
+    return None if max_depth is None else max_depth - depth + 1
+
+
+def _spans(n: int, size: int) -> Iterator[tuple[int, int]]:
+    """(start, end) of consecutive slices of at most ``size`` items."""
+    for start in range(0, n, size):
+        yield start, min(start + size, n)
+
+
+def _replace_in(container: List[Any], stub: Any, items: List[Any]) -> None:
+    for i, item in enumerate(container):
+        if item is stub:
+            del container[i]
+            container[i:i] = items
+            return
+
+
+def drop_deep_stubs(
+    comments: Any,
+    max_depth: int,
+    stub_types: tuple[type, ...] = _STUB_TYPES,
+) -> None:
+    """
+    Remove the stubs of a comment forest whose comments would sit below
+    ``max_depth``, such as the "continue this thread" links Reddit leaves
+    where a depth-limited fetch was cut, so they are never requested.
+    """
+    stubs, _ = _gather_stubs(_replies_list(comments), stub_types)
+    for container, stub, depth in stubs:
+        if depth > max_depth:
+            _replace_in(container, stub, [])
+
+
+def expand_comments(
+    submission: Any,
+    reddit: Any,
+    *,
+    max_workers: int = 4,
+    max_requests: Optional[int] = None,
+    max_comments: Optional[int] = None,
+    timeout_s: Optional[float] = None,
+    max_depth: Optional[int] = None,
+    known_ids: Optional[Collection[str]] = None,
+) -> bool:
+    """
+    Replace every MoreComments stub under ``submission`` in place.
+
+    ``submission`` may be a PRAW Submission or a raw.RawSubmission; the
+    latter is expanded with raw JSON requests into raw records.
+
+    Equivalent to ``submission.comments.replace_more(limit=None)``, but
+    works in rounds: each round collects all pending stubs, packs their
+    child IDs into /api/morechildren requests of up to 100 IDs, and
+    resolves "continue this thread" stubs concurrently on a thread pool.
+    Results are stitched into the slot the stub occupied, which is where
+    replace_more would have appended them, so collectors see the same
+    traversal order.
+
+    /api/morechildren only allows one request in flight per client, so
+    those batches are serialized; the savings there come from packing
+    several stubs into each request.
+
+    Expansion stops early once any budget is spent: ``max_requests`` API
+    calls, ``max_comments`` comments in the tree, or ``timeout_s`` seconds
+    (checked before each request, so one in-flight request may overrun).
+    Unresolved stubs are then dropped, leaving a partial tree.
+
+    With ``max_depth`` set, stubs whose comments would sit deeper than
+    that are dropped without a request, and the remaining requests ask
+    Reddit for no more levels than are still needed. Dropping these does
+    not make the result incomplete, since the collectors would discard
+    those comments anyway.
+
+    ``known_ids`` (comment IDs without prefix, e.g. from an earlier
+    capture) are not requested again: Reddit lists every hidden comment
+    in a stub's children, so stubs holding only known IDs are dropped
+    without a request and the rest ask only for the unknown ones.
+
+    Returns True if every stub was resolved, False if a budget cut
+    expansion short.
+    """
+    forest = _replies_list(submission.comments)
+    lock = threading.Lock()
+    seen: set[tuple[str, tuple[str, ...]]] = set()
+    deadline = None if timeout_s is None else time.monotonic() + timeout_s
+    requests_left = max_requests
+    complete = True
+    while True:
+        stubs, by_name = _gather_stubs(forest)
+        if not stubs:
+            return complete
+        if (
+            _expired(deadline)
+            or requests_left == 0
+            or (max_comments is not None and len(by_name) >= max_comments)
+        ):
+            for container, stub, _ in stubs:
+                _replace_in(container, stub, [])
+            return False
+        # Drop stubs Reddit hands back unchanged so a round always progresses
+        # and skip anything below max_depth.
+        fresh: List[tuple[List[Any], Any, int]] = []
+        for container, stub, depth in stubs:
+            key = (stub.parent_id, tuple(stub.children))
+            if key in seen or (max_depth is not None and depth > max_depth):
+                _replace_in(container, stub, [])
+            else:
+                seen.add(key)
+                fresh.append((container, stub, depth))
+        stubs = fresh
+
+        # A parent only ever has one pending stub, so the parent's fullname
+        # identifies the slot that morechildren results should fill.
+        slot_by_parent: dict[str, tuple[List[Any], Any]] = {}
+        children_by_parent: dict[str, List[str]] = {}
+        continuations: List[tuple[List[Any], Any, int]] = []
+        ids: List[tuple[str, int]] = []
+        for container, stub, depth in stubs:
+            if stub.count == 0 or not stub.children:
+                continuations.append((container, stub, depth))
+                continue
+            children = stub.children
+            if known_ids is not None:
+                children = [c for c in children if c not in known_ids]
+                if not children:
+                    _replace_in(container, stub, [])
+                    continue
+            slot_by_parent[stub.parent_id] = (container, stub)
+            children_by_parent[stub.parent_id] = children
+            ids.extend((child, depth) for child in children)
+        room = None if max_comments is None else max_comments - len(by_name)
+        if room is not None and len(ids) > room:
+            ids = ids[:room]
+            complete = False
+        batches = [
+            ids[start:end]
+            for start, end in _spans(len(ids), MORECHILDREN_MAX_IDS)
+        ]
+        if requests_left is not None:
+            if len(batches) + len(continuations) > requests_left:
+                complete = False
+            batches = batches[:requests_left]
+            requests_left -= len(batches)
+            # Unrequested continuations stay in the tree until the next
+            # round finds the budget spent and drops them
+            continuations = continuations[:requests_left]
+            requests_left -= len(continuations)
+
+        workers = max(1, min(max_workers, len(batches) + len(continuations)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            batch_futures = [
+                pool.submit(
+                    in_context(_fetch_morechildren),
+                    reddit,
+                    submission,
+                    [child for child, _ in batch],
+                    lock,
+                    deadline,
+                    _levels_left(max_depth, min(d for _, d in batch)),
+                )
+                for batch in batches
+            ]
+            continuation_futures = [
+                pool.submit(
+                    in_context(_fetch_continuation),
+                    reddit,
+                    submission,
+                    stub,
+                    deadline,
+                    _levels_left(max_depth, depth),
+                )
+                for _, stub, depth in continuations
+            ]
+            batch_results = [f.result() for f in batch_futures]
+            continuation_results = [f.result() for f in continuation_futures]
+
+        # A stub counts as expanded once a request for it came back
+        fetched = {
+            child
+            for batch, items in zip(batches, batch_results)
+            if items is not None
+            for child, _ in batch
+        }
+        metrics.add(
+            "stubs_expanded",
+            sum(
+                any(child in fetched for child in children)
+                for children in children_by_parent.values()
+            )
+            + sum(items is not None for items in continuation_results),
+        )
+
+        # Stitch results back single-threaded, in request order
+        slot_items: dict[str, List[Any]] = {p: [] for p in slot_by_parent}
+        for items in batch_results:
+            if items is None:
+                complete = False
+                continue
+            for item in items:
+                _adopt(item, submission)
+                if item.parent_id in slot_items:
+                    slot_items[item.parent_id].append(item)
+                elif item.parent_id in by_name:
+                    _replies_list(by_name[item.parent_id]).append(item)
+                else:
+                    forest.append(item)
+                if not isinstance(item, _STUB_TYPES):
+                    by_name[f"t1_{item.id}"] = item
+        for parent_id, (container, stub) in slot_by_parent.items():
+            _replace_in(container, stub, slot_items[parent_id])
+        for (container, stub, _), items in zip(
+            continuations, continuation_results
+        ):
+            if items is None:
+                complete = False
+                items = []
+            for item in items:
+                _adopt(item, submission)
+            _replace_in(container, stub, items)
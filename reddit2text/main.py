@@ -3,21 +3,110 @@ import io
 import json
 import os
 import re
-from typing import TYPE_CHECKING, Any, List, Literal, Optional, Union
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    ContextManager,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Union,
+)
 
 import praw
 from dotenv import load_dotenv
 
-from reddit2text.models import CommentDict, PostData, ThreadJson
+from reddit2text import metrics, parquet, ratelimit, raw, sqlite
+from reddit2text.cache import CachedReddit, ResponseCache, ThreadCache
+from reddit2text.expand import expand_comments
+from reddit2text.manifest import Manifest
+from reddit2text.models import (
+    BatchResult,
+    BatchStats,
+    CommentTable,
+    Credentials,
+    PostData,
+    RefreshResult,
+    ThreadStats,
+)
+from reddit2text.pool import ClientPool
+from reddit2text.snapshot import load_snapshot, merge
 
 _NEWLINES_RE = re.compile(r"\n+")
 
-if TYPE_CHECKING:
-    from praw.models.comment_forest import CommentForest
+# PRAW and raw-JSON "load more comments" placeholders
+_STUB_TYPES = (praw.models.MoreComments, raw.RawMore)
+
+Thread = Union[praw.models.Submission, raw.RawSubmission]
+
+# (path, content, append) of a file to write; bytes for binary formats,
+# rows for a database. With append set, later writes to the same path in
+# one call are appended instead of replacing it (jsonl).
+OutputFile = tuple[str, Union[str, bytes, sqlite.ThreadRows], bool]
+
+# A rendered thread: its output (or format -> output mapping) and the
+# files to write
+Rendered = tuple[Union[str, Dict[str, str]], List[OutputFile]]
+
+# Formats written as separate posts and comments files
+_RELATIONAL_FORMATS = ("csv_relational", "parquet", "sqlite")
+# Formats whose tables only exist as files, so they need a save path
+_FILE_ONLY_FORMATS = ("parquet", "sqlite")
+
+# File extension per format, used to give each of several formats its own
+# save path
+_EXTENSIONS = {
+    "txt": "txt",
+    "json": "json",
+    "jsonl": "jsonl",
+    "csv": "csv",
+    "csv_relational": "csv",
+    "parquet": "parquet",
+    "sqlite": "db",
+}
+
+# Target size of chunks yielded by the streaming API
+_CHUNK_SIZE = 64 * 1024
+
+# JSON string encoder used by json.dumps (ensure_ascii=True)
+_json_str = json.encoder.encode_basestring_ascii
 
 load_dotenv()
 
 
+def _coalesce(parts: Iterable[str]) -> Iterator[str]:
+    """Merge small string pieces into chunks of about _CHUNK_SIZE."""
+    buf: List[str] = []
+    size = 0
+    for part in parts:
+        buf.append(part)
+        size += len(part)
+        if size >= _CHUNK_SIZE:
+            yield "".join(buf)
+            buf = []
+            size = 0
+    if buf:
+        yield "".join(buf)
+
+
+def _json_line(obj: Any) -> str:
+    return json.dumps(obj, separators=(",", ":")) + "\n"
+
+
+def _author_name(author: Any, deleted: str = "[deleted]") -> str:
+    """Name of a Redditor (PRAW) or plain author string (raw engine)."""
+    if not author:
+        return deleted
+    return author if isinstance(author, str) else author.name
+
+
 class Reddit2Text:
     def __init__(
         self,
@@ -25,10 +114,37 @@ class Reddit2Text:
         client_secret: Optional[str] = None,
         user_agent: Optional[str] = None,
         *,
-        format: Optional[Literal["txt", "json", "csv", "csv_relational"]] = "txt",
+        format: Optional[
+            Literal[
+                "txt",
+                "json",
+                "jsonl",
+                "csv",
+                "csv_relational",
+                "parquet",
+                "sqlite",
+            ]
+        ] = "txt",
         max_comment_depth: Optional[int] = None,
         comment_delim: Optional[str] = "|",
         save_output_to: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        engine: Literal["praw", "json"] = "praw",
+        json_indent: Optional[int] = 2,
+        jsonl_records: Literal["thread", "comment"] = "thread",
+        expand_workers: int = 4,
+        max_expand_requests: Optional[int] = None,
+        max_comments: Optional[int] = None,
+        expand_timeout_s: Optional[float] = None,
+        cache_dir: Optional[str] = None,
+        cache_ttl_s: Optional[float] = 3600,
+        cache_max_bytes: Optional[int] = None,
+        thread_cache_size: int = 0,
+        thread_cache_max_comments: Optional[int] = None,
+        rate_limiter: Optional[ratelimit.RateLimitScheduler] = None,
+        credentials: Optional[List[Credentials]] = None,
+        on_stats: Optional[Callable[[ThreadStats], None]] = None,
+        collect_stats: bool = False,
     ) -> None:
         """
         Parameters
@@ -40,10 +156,20 @@ class Reddit2Text:
         user_agent : str
                 Tells the Reddit API who you are. Form:
                 `<app type>:<app name>:<version> (by <your username>)`
-        format : Literal['txt', 'json', 'csv', 'csv_relational'], optional
-                Display format for the thread. Use 'csv_relational' for
-                two CSVs (posts + comments) that can be joined like a DB.
-                By default 'txt'
+        format : str, optional
+                Display format for the thread: 'txt', 'json', 'jsonl',
+                'csv', 'csv_relational', 'parquet' or 'sqlite'. Use
+                'csv_relational' for two CSVs (posts + comments) that can
+                be joined like a DB.
+                'parquet' saves the same two tables as Parquet files
+                (requires pyarrow and save_output_to) and returns the
+                posts CSV.
+                'sqlite' upserts both tables into the SQLite database at
+                save_output_to (e.g. 'threads.db'), one transaction per
+                thread, and returns the posts CSV.
+                'jsonl' writes one compact JSON object per line (see
+                jsonl_records); across a multi-URL call every thread's
+                lines are appended to save_output_to. By default 'txt'
         max_comment_depth : int, optional
                 Maximum depth of comments to output, including the top-most
                 comment. 0 to exclude all; None or -1 to include all.
@@ -51,7 +177,98 @@ class Reddit2Text:
                 String used to indent comments by nesting level, by default "|"
         save_output_to : str, optional
                 Path to save the output, by default None
+        max_workers : int, optional
+                Number of threads fetched concurrently when given a list of
+                URLs. Results keep input order. None or 1 fetches serially.
+        engine : Literal['praw', 'json'], optional
+                'json' fetches the thread's raw JSON through the same
+                authenticated session and parses it into compact records
+                instead of PRAW objects; faster on large threads.
+                By default 'praw'
+        json_indent : int, optional
+                Indentation for 'json' output, by default 2. None writes
+                compact JSON with no whitespace, about half the size.
+        jsonl_records : Literal['thread', 'comment'], optional
+                Granularity of 'jsonl' lines. 'thread' writes one line per
+                thread: the json output plus a "post_id" key. 'comment'
+                writes a "post" record followed by one "comment" record
+                per comment, with the columns of csv_relational.
+                By default 'thread'
+        expand_workers : int, optional
+                Threads used to resolve "load more comments" stubs within
+                one thread, by default 4
+        max_expand_requests : int, optional
+                Stop loading hidden comments after this many API requests
+                per thread. None for no limit.
+        max_comments : int, optional
+                Stop loading hidden comments once the thread holds this many
+                comments. None for no limit.
+        expand_timeout_s : float, optional
+                Stop loading hidden comments after this many seconds per
+                thread. None for no limit.
+
+                When any of these budgets is spent the partial thread is
+                returned and flagged as incomplete: an "incomplete" key in
+                json output and a note under the txt comment header.
+        cache_dir : str, optional
+                Directory for an on-disk cache of the API responses that
+                make up each thread (submission listing, morechildren and
+                continuation requests). Safe to share between processes.
+                The requested depth is part of each entry's key, so runs
+                with different max_comment_depth are cached separately.
+                None disables it.
+        cache_ttl_s : float, optional
+                Seconds a cached response stays fresh, by default 3600.
+                Archived posts never expire. None keeps entries forever.
+        cache_max_bytes : int, optional
+                Evict least recently used entries once the cache grows past
+                this size. None for no limit.
+        thread_cache_size : int, optional
+                Keep this many fetched threads in memory (least recently
+                used first out), keyed by submission ID, so rendering the
+                same thread again skips the fetch. By default 0 (off).
+                Use invalidate() to drop entries.
+        thread_cache_max_comments : int, optional
+                Also bound the thread cache by the total number of
+                comments it holds. None for no limit.
+        rate_limiter : RateLimitScheduler, optional
+                Scheduler that paces requests against Reddit's rate-limit
+                headers, shared by all worker threads. Pass the same one
+                to several instances using the same credentials so they
+                share the quota. By default each instance gets its own.
+        credentials : list of dict, optional
+                Several Reddit API apps ({'client_id', 'client_secret',
+                'user_agent'}) to spread requests across. Each app has its
+                own rate-limit scheduler; requests go to the healthy app
+                with the most quota left, and an app answering with an
+                auth or rate-limit error is benched while the request is
+                retried on another. Replaces client_id/client_secret/
+                user_agent and rate_limiter.
+        on_stats : callable, optional
+                Called with a ThreadStats dict once each URL of a
+                textualize_post / textualize_batch / textualize_subreddit
+                call is done (or failed): seconds spent fetching,
+                expanding hidden comments, traversing, formatting and
+                writing, plus comment count and output bytes, and the
+                HTTP requests made for it (requests, retries, stubs
+                expanded, response bytes, rate-limit waits). Called on
+                the calling thread, in result order.
+        collect_stats : bool, optional
+                Collect the same stats without a callback. Either way,
+                after each of those calls batch_stats holds the totals
+                over its URLs (including batch-level requests such as
+                listing pages). By default False.
         """
+        if credentials:
+            if rate_limiter is not None:
+                raise ValueError(
+                    "credentials gives each app its own rate limiter; "
+                    "rate_limiter cannot be combined with it"
+                )
+            client_id = client_id or credentials[0]["client_id"]
+            client_secret = client_secret or credentials[0]["client_secret"]
+            user_agent = user_agent or credentials[0]["user_agent"]
+
         # Optionally fetch the credentials from the environment variables
         self.client_id = client_id or os.getenv("REDDIT_CLIENT_ID")
         self.client_secret = client_secret or os.getenv("REDDIT_CLIENT_SECRET")
@@ -66,168 +283,313 @@ class Reddit2Text:
         self.max_comment_depth = max_comment_depth
         self.comment_delim = comment_delim
         self.save_output_to = save_output_to
-
-        self._praw_reddit = praw.Reddit(
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            user_agent=self.user_agent,
+        self.max_workers = max_workers
+        self.engine = engine
+        self.json_indent = json_indent
+        self.jsonl_records = jsonl_records
+        self.expand_workers = expand_workers
+        self.max_expand_requests = max_expand_requests
+        self.max_comments = max_comments
+        self.expand_timeout_s = expand_timeout_s
+        self.cache_dir = cache_dir
+        self.cache_ttl_s = cache_ttl_s
+        self.cache_max_bytes = cache_max_bytes
+        self.rate_limiter = rate_limiter or ratelimit.RateLimitScheduler()
+        self.credentials = credentials
+        self.client_pool: Optional[ClientPool] = None
+        self.on_stats = on_stats
+        self.collect_stats = collect_stats
+        self.batch_stats: Optional[BatchStats] = None
+        self._thread_cache = (
+            ThreadCache(thread_cache_size, thread_cache_max_comments)
+            if thread_cache_size > 0
+            else None
         )
 
-    def _handle_output(self, output: str) -> None:
-        if self.save_output_to:
-            with open(self.save_output_to, "w") as f:
-                f.write(output)
+        self._praw_reddit = self._make_reddit()
 
-    def _collect_comments(
-        self,
-        comments: "CommentForest",
-        depth: int = 1,
-    ) -> List[dict[str, Any]]:
-        out: List[dict[str, Any]] = []
-        if self.max_comment_depth == 0:
-            return out
-        max_depth = self.max_comment_depth
-        stack: List[tuple[Any, int]] = [
-            (c, depth)
-            for c in reversed(list(comments))
-            if not isinstance(c, praw.models.MoreComments)
-        ]
-        while stack:
-            comment, d = stack.pop()
-            if max_depth is not None and max_depth != -1 and d > max_depth:
-                continue
-            author = comment.author.name if comment.author else "[deleted]"
-            body = _NEWLINES_RE.sub(" ", comment.body)
-            out.append(
-                {"depth": d, "author": author, "score": comment.score, "body": body}
+    def _make_reddit(self) -> Any:
+        reddit: praw.Reddit
+        if self.cache_dir:
+            reddit = CachedReddit(
+                ResponseCache(
+                    self.cache_dir, self.cache_ttl_s, self.cache_max_bytes
+                ),
+                client_id=self.client_id,
+                client_secret=self.client_secret,
+                user_agent=self.user_agent,
             )
-            if max_depth is None or max_depth == -1 or d + 1 <= max_depth:
-                for reply in reversed(list(comment.replies)):
-                    if not isinstance(reply, praw.models.MoreComments):
-                        stack.append((reply, d + 1))
-        return out
+        else:
+            reddit = praw.Reddit(
+                client_id=self.client_id,
+                client_secret=self.client_secret,
+                user_agent=self.user_agent,
+            )
+        self.rate_limiter.install(reddit)
+        if self.credentials:
+            self.client_pool = ClientPool.from_credentials(self.credentials)
+            self.client_pool.install(reddit)
+        return reddit
 
-    def _collect_comments_relational(
+    def priority(self, level: int) -> ContextManager[None]:
+        """
+        Context manager giving the requests of the calls made inside it
+        priority ``level`` (default 0; higher goes first) when they queue
+        for rate-limit quota, e.g. interactive calls ahead of a crawl
+        running on another thread.
+        """
+        return ratelimit.priority(level)
+
+    def _depth_limit(self) -> Optional[int]:
+        """max_comment_depth as a positive limit, or None for unlimited."""
+        if self.max_comment_depth is None or self.max_comment_depth == -1:
+            return None
+        return self.max_comment_depth
+
+    def _handle_output(
         self,
-        comments: "CommentForest",
-        post_id: str,
-        depth: int = 1,
-    ) -> List[dict[str, Any]]:
-        """Collect comments with comment_id and parent_id for relational CSV."""
-        out: List[dict[str, Any]] = []
-        if self.max_comment_depth == 0:
-            return out
-        max_depth = self.max_comment_depth
-        stack: List[tuple[Any, int]] = [
-            (c, depth)
-            for c in reversed(list(comments))
-            if not isinstance(c, praw.models.MoreComments)
-        ]
-        while stack:
-            comment, d = stack.pop()
-            if max_depth is not None and max_depth != -1 and d > max_depth:
-                continue
-            parent = comment.parent()
-            parent_id = parent.id if hasattr(parent, "id") else post_id
-            author = comment.author.name if comment.author else "[deleted]"
-            body = _NEWLINES_RE.sub(" ", comment.body)
-            out.append(
-                {
-                    "comment_id": comment.id,
-                    "post_id": post_id,
-                    "parent_id": parent_id,
-                    "depth": d,
-                    "author": author,
-                    "score": comment.score,
-                    "body": body,
-                }
-            )
-            if max_depth is None or max_depth == -1 or d + 1 <= max_depth:
-                for reply in reversed(list(comment.replies)):
-                    if not isinstance(reply, praw.models.MoreComments):
-                        stack.append((reply, d + 1))
-        return out
+        output: Union[str, bytes, sqlite.ThreadRows],
+        path: Optional[str] = None,
+        mode: str = "w",
+    ) -> None:
+        path = path or self.save_output_to
+        if path:
+            if isinstance(output, sqlite.ThreadRows):
+                sqlite.write_thread(path, output)
+                return
+            if isinstance(output, bytes):
+                mode += "b"
+            with open(path, mode) as f:
+                f.write(output)
 
-    def _collect_comments_nested(
+    def _write_files(
         self,
-        comments: "CommentForest",
+        files: List[OutputFile],
+        written: set[str],
+        stats: Optional[ThreadStats] = None,
+    ) -> None:
+        """
+        Write one thread's files. ``written`` holds the paths already
+        written during this call: appendable files (jsonl) are appended
+        to them, everything else overwrites.
+        """
+        with metrics.collect(stats), metrics.phase("write_s"):
+            for path, content, append in files:
+                mode = "a" if append and path in written else "w"
+                self._handle_output(content, path, mode)
+                written.add(path)
+
+    def _collecting(self) -> bool:
+        return self.on_stats is not None or self.collect_stats
+
+    def _new_stats(self, url: str) -> Optional[ThreadStats]:
+        return metrics.new(url) if self._collecting() else None
+
+    def _start_batch(self) -> None:
+        self.batch_stats = metrics.new_batch() if self._collecting() else None
+
+    def _emit_stats(
+        self, stats: Optional[ThreadStats], url: bool = True
+    ) -> None:
+        """
+        Add a URL's stats (or, with ``url`` False, batch-level work) to
+        batch_stats and pass them to on_stats.
+        """
+        if stats is None:
+            return
+        if self.batch_stats is not None:
+            metrics.merge(self.batch_stats, stats, url)
+        if url and self.on_stats is not None:
+            self.on_stats(stats)
+
+    def _build_comment_table(
+        self,
+        comments: Any,
         depth: int = 1,
-    ) -> List[CommentDict]:
-        out: List[CommentDict] = []
+    ) -> CommentTable:
+        """
+        Walk the comment forest once, in pre-order, into a CommentTable.
+
+        This is the only pass over PRAW objects (or raw records); stubs are
+        skipped and max_comment_depth is applied here.
+        """
+        table = CommentTable()
         if self.max_comment_depth == 0:
-            return out
+            return table
         max_depth = self.max_comment_depth
-        # Stack: (comment, depth, list to append this comment's dict to)
-        stack: List[tuple[Any, int, List[CommentDict]]] = [
-            (c, depth, out)
+        # Stack: (comment, depth, parent row index)
+        stack: List[tuple[Any, int, int]] = [
+            (c, depth, -1)
             for c in reversed(list(comments))
-            if not isinstance(c, praw.models.MoreComments)
+            if not isinstance(c, _STUB_TYPES)
         ]
         while stack:
-            comment, d, parent_list = stack.pop()
+            comment, d, parent = stack.pop()
             if max_depth is not None and max_depth != -1 and d > max_depth:
                 continue
-            author = comment.author.name if comment.author else "[deleted]"
-            body = _NEWLINES_RE.sub(" ", comment.body)
-            node: CommentDict = {
-                "author": author,
-                "score": comment.score,
-                "body": body,
-                "replies": [],
-            }
-            parent_list.append(node)
+            row = table.append(
+                comment.id,
+                parent,
+                d,
+                _author_name(comment.author),
+                comment.score,
+                _NEWLINES_RE.sub(" ", comment.body),
+            )
+            # A reply whose parent was not fetched (skipped as known
+            # during a refresh) is left at the top of the forest
+            parent_id = getattr(comment, "parent_id", "")
+            if parent == -1 and parent_id.startswith("t1_"):
+                table.orphan_parents[row] = parent_id[3:]
             if max_depth is None or max_depth == -1 or d + 1 <= max_depth:
                 for reply in reversed(list(comment.replies)):
-                    if not isinstance(reply, praw.models.MoreComments):
-                        stack.append((reply, d + 1, node["replies"]))
-        return out
+                    if not isinstance(reply, _STUB_TYPES):
+                        stack.append((reply, d + 1, row))
+        return table
 
-    def _process_comments(
-        self,
-        comments: "CommentForest",
-        depth: int = 1,
-    ) -> str:
-        if self.max_comment_depth == 0:
-            return ""
-        max_depth = self.max_comment_depth
-        parts: List[str] = []
-        stack: List[tuple[Any, int]] = [
-            (c, depth)
-            for c in reversed(list(comments))
-            if not isinstance(c, praw.models.MoreComments)
-        ]
-        while stack:
-            comment, d = stack.pop()
-            if max_depth is not None and max_depth != -1 and d > max_depth:
-                continue
+    def _iter_txt(self, pd: PostData, table: CommentTable) -> Iterator[str]:
+        text_post = (
+            f"Title: {pd['title']}\nAuthor: {pd['author']}\n"
+            f"Upvotes: {pd['upvotes']}\n"
+        )
+        if pd["selftext"]:
+            text_post += f"Body text: {pd['selftext']}\n"
+        comment_header = (
+            f"\n{pd['num_comments']} Comments:\n--------\n"
+            if self.max_comment_depth != 0
+            else ""
+        )
+        if comment_header and pd.get("incomplete"):
+            comment_header += (
+                "[Incomplete: comment loading stopped at the configured "
+                "budget]\n"
+            )
+        yield text_post + comment_header
+        for d, author, score, body in zip(
+            table.depths, table.authors, table.scores, table.bodies
+        ):
             prefix = f"{self.comment_delim} " * d
-            author = comment.author.name if comment.author else "[deleted]"
-            score = comment.score
             upvotes_or_downvotes = "upvotes" if score >= 0 else "downvotes"
-            comment_body = _NEWLINES_RE.sub(" ", comment.body)
-            parts.append(
-                f"{prefix}{author} ({score} {upvotes_or_downvotes}): "
-                f"{comment_body}\n"
+            yield (
+                f"{prefix}{author} ({score} {upvotes_or_downvotes}): {body}\n"
             )
-            if max_depth is None or max_depth == -1 or d + 1 <= max_depth:
-                for reply in reversed(list(comment.replies)):
-                    if not isinstance(reply, praw.models.MoreComments):
-                        stack.append((reply, d + 1))
-        return "".join(parts)
 
-    def _format_json(
-        self,
-        post_data: PostData,
-        comments_list: List[CommentDict],
-    ) -> str:
-        obj: ThreadJson = {"post": post_data, "comments": comments_list}
-        return json.dumps(obj, indent=2)
+    def _iter_json(
+        self, pd: PostData, table: CommentTable, indent: Optional[int]
+    ) -> Iterator[str]:
+        """
+        Encode the nested ThreadJson shape straight from the flat table,
+        without building the nested dicts or one big string.
+
+        With ``indent`` set the text is byte-identical to
+        json.dumps(thread, indent=indent); with None it matches
+        json.dumps(thread, separators=(",", ":")).
+        """
+        key_sep = ":" if indent is None else ": "
+
+        def pad(level: int) -> str:
+            return "" if indent is None else "\n" + " " * (indent * level)
+
+        post = json.dumps(pd, indent=indent, separators=(",", key_sep))
+        if indent is not None:
+            post = post.replace("\n", pad(1))
+        yield (
+            "{"
+            + pad(1)
+            + '"post"'
+            + key_sep
+            + post
+            + ","
+            + pad(1)
+            + '"comments"'
+            + key_sep
+        )
+        if not len(table):
+            yield "[]" + pad(0) + "}"
+            return
+        yield "["
+
+        enc = _json_str
+        depths = table.depths
+        last = len(table) - 1
+        # A comment at depth d is a JSON object at nesting level 2 * d (its
+        # list, then the object); the root object and its "comments" list
+        # behave like depth 0.
+        for i, (d, author, score, body) in enumerate(
+            zip(depths, table.authors, table.scores, table.bodies)
+        ):
+            k = 2 * d
+            field = pad(k + 1)
+            parts = [
+                pad(k),
+                "{",
+                field,
+                '"author"',
+                key_sep,
+                enc(author),
+                ",",
+                field,
+                '"score"',
+                key_sep,
+                str(score),
+                ",",
+                field,
+                '"body"',
+                key_sep,
+                enc(body),
+                ",",
+                field,
+                '"replies"',
+                key_sep,
+            ]
+            next_d = depths[i + 1] if i < last else 0
+            if next_d > d:
+                # Pre-order: the next row is this comment's first reply
+                parts.append("[")
+            else:
+                parts.append("[]" + pad(k) + "}")
+                # Close the replies list and object of each finished
+                # ancestor, down to the next row's depth
+                for level in range(d - 1, next_d - 1, -1):
+                    parts.append(pad(2 * level + 1) + "]" + pad(2 * level))
+                    parts.append("}")
+                if next_d:
+                    parts.append(",")
+            yield "".join(parts)
+
+    def _iter_jsonl(
+        self, post_id: str, pd: PostData, table: CommentTable
+    ) -> Iterator[str]:
+        """One compact JSON object per line, each ending in a newline."""
+        if self.jsonl_records == "thread":
+            parts = self._iter_json(pd, table, None)
+            # Splice the post_id in front of the "post" key
+            yield '{"post_id":' + _json_str(post_id) + "," + next(parts)[1:]
+            yield from parts
+            yield "\n"
+            return
 
-    def _format_csv(
+        yield _json_line({"record": "post", "post_id": post_id, **pd})
+        ids = table.ids
+        for i in range(len(table)):
+            parent = table.parents[i]
+            yield _json_line(
+                {
+                    "record": "comment",
+                    "comment_id": ids[i],
+                    "post_id": post_id,
+                    "parent_id": ids[parent] if parent != -1 else post_id,
+                    "depth": table.depths[i],
+                    "author": table.authors[i],
+                    "score": table.scores[i],
+                    "body": table.bodies[i],
+                }
+            )
+
+    def _iter_csv(
         self,
         post_data: dict[str, Any],
-        comments_list: List[dict[str, Any]],
-    ) -> str:
+        table: CommentTable,
+    ) -> Iterator[str]:
         buf = io.StringIO()
         w = csv.writer(buf)
         w.writerow(["depth", "author", "score", "body"])
@@ -247,17 +609,38 @@ class Reddit2Text:
                 ).strip(),
             ]
         )
-        for c in comments_list:
-            w.writerow([c["depth"], c["author"], c["score"], c["body"]])
-        return buf.getvalue()
+        rows = zip(table.depths, table.authors, table.scores, table.bodies)
+        for row in rows:
+            w.writerow(row)
+            if buf.tell() >= _CHUNK_SIZE:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        yield buf.getvalue()
 
-    def _format_csv_relational(
+    def _iter_output(
         self,
         post_id: str,
-        post_data: dict[str, Any],
-        comments_list: List[dict[str, Any]],
-    ) -> tuple[str, str]:
-        """Return (posts_csv, comments_csv) for relational output."""
+        pd: PostData,
+        table: CommentTable,
+        fmt: Optional[str] = None,
+    ) -> Iterator[str]:
+        """Output chunks (of roughly _CHUNK_SIZE) for single-file formats."""
+        fmt = fmt or self.format
+        if fmt == "json":
+            parts = self._iter_json(pd, table, self.json_indent)
+        elif fmt == "jsonl":
+            parts = self._iter_jsonl(post_id, pd, table)
+        elif fmt == "csv":
+            parts = self._iter_csv(dict[str, Any](pd), table)
+        else:
+            parts = self._iter_txt(pd, table)
+        return _coalesce(parts)
+
+    def _format_posts_csv(
+        self, post_id: str, post_data: dict[str, Any]
+    ) -> str:
+        """The one-row posts CSV of the relational formats."""
         posts_buf = io.StringIO()
         posts_w = csv.writer(posts_buf)
         posts_w.writerow(
@@ -273,6 +656,16 @@ class Reddit2Text:
                 post_data["num_comments"],
             ]
         )
+        return posts_buf.getvalue()
+
+    def _format_csv_relational(
+        self,
+        post_id: str,
+        post_data: dict[str, Any],
+        table: CommentTable,
+    ) -> tuple[str, str]:
+        """Return (posts_csv, comments_csv) for relational output."""
+        posts_csv = self._format_posts_csv(post_id, post_data)
         comments_buf = io.StringIO()
         comments_w = csv.writer(comments_buf)
         comments_w.writerow(
@@ -286,107 +679,620 @@ class Reddit2Text:
                 "body",
             ]
         )
-        for c in comments_list:
+        ids = table.ids
+        for i in range(len(table)):
+            parent = table.parents[i]
             comments_w.writerow(
                 [
-                    c["comment_id"],
-                    c["post_id"],
-                    c["parent_id"],
-                    c["depth"],
-                    c["author"],
-                    c["score"],
-                    c["body"],
+                    ids[i],
+                    post_id,
+                    ids[parent] if parent != -1 else post_id,
+                    table.depths[i],
+                    table.authors[i],
+                    table.scores[i],
+                    table.bodies[i],
                 ]
             )
-        return posts_buf.getvalue(), comments_buf.getvalue()
+        return posts_csv, comments_buf.getvalue()
 
-    def _process_original_post(self, thread: praw.models.Submission) -> str:
+    def _build_post_data(self, thread: Thread) -> PostData:
         # Fetch the title, author, upvotes, and post text
         # OP's info
-        self.post_data: PostData = {
+        return {
             "title": thread.title,
-            "author": thread.author.name if thread.author else "deleted",
+            "author": _author_name(thread.author, "deleted"),
             "upvotes": thread.score,
             "selftext": _NEWLINES_RE.sub(" ", thread.selftext),  # Replace newlines to avoid breaking the structure
             "num_comments": thread.num_comments,
         }
 
+    def _process_original_post(
+        self, thread: Thread, known_ids: Optional[Collection[str]] = None
+    ) -> PostData:
+        # First attribute access fetches a lazy PRAW submission
+        with metrics.phase("fetch_s"):
+            post_data = self._build_post_data(thread)
+
         # Ensure all comments are fetched
         if self.max_comment_depth != 0:
-            thread.comments.replace_more(limit=None)
+            with metrics.phase("expand_s"):
+                complete = expand_comments(
+                    thread,
+                    self._praw_reddit,
+                    max_workers=self.expand_workers,
+                    max_requests=self.max_expand_requests,
+                    max_comments=self.max_comments,
+                    timeout_s=self.expand_timeout_s,
+                    max_depth=self._depth_limit(),
+                    known_ids=known_ids,
+                )
+            if not complete:
+                post_data["incomplete"] = True
 
-        # Start building the final output string
-        pd = self.post_data
-        original_post_output = (
-            f"Title: {pd['title']}\nAuthor: {pd['author']}\n"
-            f"Upvotes: {pd['upvotes']}\n"
+        return post_data
+
+    def _fetch_thread(
+        self, url: str, known_ids: Optional[Collection[str]] = None
+    ) -> tuple[Thread, PostData]:
+        """
+        Fetch a thread and expand its comments, ready to render. Hidden
+        comments in ``known_ids`` are not requested.
+        """
+        # PRAW auto-handles extracting the post ID from the URL
+        reddit = self._praw_reddit
+        depth_limit = self._depth_limit() or None
+        thread: Thread
+        if self.engine == "json":
+            with metrics.phase("fetch_s"):
+                thread = raw.fetch_submission(reddit, url, depth=depth_limit)
+        else:
+            submission = reddit.submission(url=url)
+            if depth_limit:
+                # Have Reddit prune the tree instead of discarding it locally
+                submission.add_fetch_param("depth", str(depth_limit))
+            thread = submission
+
+        # Convert the original post and comments
+        pd = self._process_original_post(thread, known_ids)
+        return thread, pd
+
+    def _textualize_one(
+        self,
+        url: str,
+        formats: Optional[List[str]] = None,
+        header: Optional[Thread] = None,
+        save_to: Optional[str] = None,
+    ) -> Rendered:
+        """
+        Fetch and render a single thread.
+
+        Returns the output string (or a format -> output mapping when
+        ``formats`` is given) and the files to write when ``save_to`` (by
+        default save_output_to) is set. Nothing is written here so that
+        concurrent workers never race on the output files.
+        """
+        post_id, pd, table = self._load_thread(url, header)
+        rendered: Rendered
+        if formats is None:
+            rendered = self._render_table(post_id, pd, table, None, save_to)
+        else:
+            outputs: Dict[str, str] = {}
+            files: List[OutputFile] = []
+            for fmt in formats:
+                outputs[fmt], fmt_files = self._render_table(
+                    post_id, pd, table, fmt, self._format_path(fmt, save_to)
+                )
+                files.extend(fmt_files)
+            rendered = outputs, files
+        stats = metrics.current.get()
+        if stats is not None:
+            output = rendered[0]
+            parts = output.values() if isinstance(output, dict) else [output]
+            stats["comments"] = len(table)
+            stats["output_bytes"] = sum(len(p.encode()) for p in parts)
+        return rendered
+
+    def _format_path(
+        self, fmt: str, save_to: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        ``save_to`` (by default save_output_to) with its extension swapped
+        for ``fmt``'s.
+        """
+        save_to = save_to or self.save_output_to
+        if not save_to:
+            return None
+        base = save_to.rsplit(".", 1)[0] if "." in save_to else save_to
+        return f"{base}.{_EXTENSIONS[fmt]}"
+
+    @staticmethod
+    def _submission_id(url: str) -> str:
+        try:
+            submission_id: str = praw.models.Submission.id_from_url(url)
+        except praw.exceptions.InvalidURL:
+            return url
+        return submission_id
+
+    def _thread_cache_key(self, url: str) -> tuple[Any, ...]:
+        """Normalized submission ID plus the settings that shape the tree."""
+        return (
+            self._submission_id(url),
+            self.engine,
+            self._depth_limit(),
+            self.max_expand_requests,
+            self.max_comments,
         )
-        if pd["selftext"]:
-            original_post_output += f"Body text: {pd['selftext']}\n"
 
-        return original_post_output
+    def _load_thread(
+        self, url: str, header: Optional[Thread] = None
+    ) -> tuple[str, PostData, CommentTable]:
+        """
+        (post_id, post data, comment table) for a URL, from the thread
+        cache when enabled, else fetched and expanded. ``header`` is the
+        already-resolved post when no comments are wanted.
+        """
+        cache = self._thread_cache
+        if cache is None:
+            return self._fetch_entry(url, header)
+        key = self._thread_cache_key(url)
+        hit = cache.get(key)
+        if hit is not None:
+            return hit
+        # One fetch per key: concurrent loads wait and reuse its entry
+        with cache.loading(key):
+            hit = cache.get(key)
+            if hit is not None:
+                return hit
+            entry = self._fetch_entry(url, header)
+            # A thread cut short by an expansion budget (which may be a
+            # timeout) is not reused
+            if not entry[1].get("incomplete"):
+                cache.put(key, entry)
+        return entry
+
+    def _fetch_entry(
+        self, url: str, header: Optional[Thread] = None
+    ) -> tuple[str, PostData, CommentTable]:
+        if header is not None:
+            # Do not touch .comments, which would fetch the whole thread
+            return (header.id, self._build_post_data(header), CommentTable())
+        thread, pd = self._fetch_thread(url)
+        with metrics.phase("traverse_s"):
+            table = self._build_comment_table(thread.comments)
+        return (thread.id, pd, table)
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """
+        Drop ``url``'s thread (every cached variant) from the thread
+        cache, or the whole cache when no URL is given.
+        """
+        if self._thread_cache is None:
+            return
+        if url is None:
+            self._thread_cache.clear()
+        else:
+            self._thread_cache.invalidate(self._thread_cache_key(url)[0])
+
+    def _render_thread(
+        self, thread: Thread, pd: PostData
+    ) -> tuple[str, List[OutputFile]]:
+        """Render an already-expanded thread in the configured format."""
+        table = self._build_comment_table(thread.comments)
+        return self._render_table(thread.id, pd, table)
+
+    def _render_table(
+        self,
+        post_id: str,
+        pd: PostData,
+        table: CommentTable,
+        fmt: Optional[str] = None,
+        save_to: Optional[str] = None,
+    ) -> tuple[str, List[OutputFile]]:
+        """
+        Render a thread's comment table in ``fmt`` (by default the
+        configured format), saving to ``save_to`` (by default
+        save_output_to).
+        """
+        with metrics.phase("format_s"):
+            return self._format_table(post_id, pd, table, fmt, save_to)
+
+    def _format_table(
+        self,
+        post_id: str,
+        pd: PostData,
+        table: CommentTable,
+        fmt: Optional[str],
+        save_to: Optional[str],
+    ) -> tuple[str, List[OutputFile]]:
+        fmt = fmt or self.format
+        save_to = save_to or self.save_output_to
+        files: List[OutputFile] = []
+
+        if fmt in _FILE_ONLY_FORMATS and not save_to:
+            raise ValueError(f"format={fmt!r} requires save_output_to")
+        if fmt in _RELATIONAL_FORMATS:
+            base = None
+            if save_to:
+                base = save_to.rsplit(".", 1)[0] if "." in save_to else save_to
+            if fmt == "sqlite":
+                posts_csv = self._format_posts_csv(post_id, dict[str, Any](pd))
+                if save_to:
+                    files.append(
+                        (save_to, sqlite.ThreadRows(post_id, pd, table), False)
+                    )
+            elif fmt == "parquet":
+                # Columnar files built from the table, no CSV round-trip
+                posts_csv = self._format_posts_csv(post_id, dict[str, Any](pd))
+                if base:
+                    files.append(
+                        (
+                            f"{base}_posts.parquet",
+                            parquet.posts_parquet(post_id, pd),
+                            False,
+                        )
+                    )
+                    files.append(
+                        (
+                            f"{base}_comments.parquet",
+                            parquet.comments_parquet(post_id, table),
+                            False,
+                        )
+                    )
+            else:
+                posts_csv, comments_csv = self._format_csv_relational(
+                    post_id, dict[str, Any](pd), table
+                )
+                if base:
+                    files.append((f"{base}_posts.csv", posts_csv, False))
+                    files.append((f"{base}_comments.csv", comments_csv, False))
+            final_output = posts_csv
+        else:
+            final_output = "".join(self._iter_output(post_id, pd, table, fmt))
+            if save_to:
+                files.append((save_to, final_output, fmt == "jsonl"))
+        return final_output, files
+
+    def _try_textualize_one(
+        self,
+        url: str,
+        formats: Optional[List[str]] = None,
+        header: Optional[Thread] = None,
+        save_to: Optional[str] = None,
+    ) -> tuple[Union[Rendered, Exception], Optional[ThreadStats]]:
+        """
+        The rendered thread or the exception it raised, with the URL's
+        stats so far when stats are collected.
+        """
+        stats = self._new_stats(url)
+        with metrics.collect(stats):
+            try:
+                rendered = self._textualize_one(url, formats, header, save_to)
+                return rendered, stats
+            except Exception as e:
+                if stats is not None:
+                    stats["error"] = f"{type(e).__name__}: {e}"
+                return e, stats
+
+    def _fetch_headers(self, urls: List[str]) -> Dict[str, Thread]:
+        """
+        Resolve the posts behind ``urls`` with one /api/info request per
+        100 IDs, keyed by submission ID. Posts that do not come back are
+        left out and fetched one by one as usual.
+        """
+        fullnames = list(
+            dict.fromkeys(f"t3_{self._submission_id(url)}" for url in urls)
+        )
+        threads: Iterable[Thread]
+        if self.engine == "json":
+            threads = raw.fetch_info(self._praw_reddit, fullnames)
+        else:
+            threads = self._praw_reddit.info(fullnames=fullnames)
+        return {thread.id: thread for thread in threads}
+
+    def _run_batch(
+        self,
+        urls: List[str],
+        formats: Optional[List[str]] = None,
+        save_paths: Optional[List[Optional[str]]] = None,
+    ) -> Iterator[tuple[Union[Rendered, Exception], Optional[ThreadStats]]]:
+        """
+        Render every URL, yielding results (or the raised exception) and
+        stats in input order. Uses a bounded thread pool when max_workers > 1.
+        """
+        paths = save_paths or [None] * len(urls)
+        headers: Dict[str, Thread] = {}
+        if self.max_comment_depth == 0 and len(urls) > 1:
+            # Header-only batch: N/100 requests instead of N
+            overhead = self._new_stats("")
+            try:
+                with metrics.collect(overhead):
+                    headers = self._fetch_headers(urls)
+            except Exception:
+                pass  # each URL is fetched (and fails) on its own below
+            self._emit_stats(overhead, url=False)
+        url_headers = [headers.get(self._submission_id(url)) for url in urls]
+        workers = min(self.max_workers or 1, len(urls))
+        if workers <= 1:
+            for url, header, path in zip(urls, url_headers, paths):
+                yield self._try_textualize_one(url, formats, header, path)
+            return
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(
+                ratelimit.in_context(self._try_textualize_one),
+                urls,
+                [formats] * len(urls),
+                url_headers,
+                paths,
+            )
 
     def textualize_post(
-        self, urls: Union[str, List[str]]
-    ) -> Union[str, List[str]]:
+        self,
+        urls: Union[str, List[str]],
+        formats: Optional[List[str]] = None,
+    ) -> Union[str, List[str], Dict[str, str], List[Dict[str, str]]]:
+        """
+        Fetch and render one URL (returns a str) or a list of URLs
+        (returns a list), writing to save_output_to when set.
+
+        With ``formats`` (e.g. ["txt", "json", "csv_relational"]) each
+        thread is fetched and expanded once and rendered in every listed
+        format; each URL then gives a format -> output mapping, and files
+        are saved next to save_output_to with each format's extension
+        (out.txt, out.json, out_posts.csv / out_comments.csv, ...).
+        """
         if isinstance(urls, str):
             urls = [urls]
+        self._check_formats(formats)
+        self._start_batch()
 
-        final_outputs = []
+        final_outputs: List[Any] = []
+        written: set[str] = set()
 
-        for url in urls:
-            # PRAW auto-handles extracting the post ID from the URL
-            reddit = self._praw_reddit
-            thread = reddit.submission(url=url)
+        for result, stats in self._run_batch(urls, formats):
+            if isinstance(result, Exception):
+                self._emit_stats(stats)
+                raise result
+            final_output, files = result
+            self._write_files(files, written, stats)
+            self._emit_stats(stats)
+            final_outputs.append(final_output)
 
-            # Convert the original post and comments
-            self._process_original_post(thread)
-            pd = self.post_data
+        if len(final_outputs) == 1:
+            first: Union[str, Dict[str, str]] = final_outputs[0]
+            return first
+        return final_outputs
 
-            if self.format == "json":
-                comments_nested = self._collect_comments_nested(
-                    thread.comments
-                )
-                final_output = self._format_json(pd, comments_nested)
-            elif self.format == "csv":
-                comments_list = self._collect_comments(thread.comments)
-                final_output = self._format_csv(
-                    dict[str, Any](pd), comments_list
-                )
-            elif self.format == "csv_relational":
-                post_id = thread.id
-                comments_list = self._collect_comments_relational(
-                    thread.comments, post_id
+    def _check_formats(self, formats: Optional[List[str]]) -> None:
+        if formats is not None:
+            unknown = [f for f in formats if f not in _EXTENSIONS]
+            if not formats or unknown:
+                raise ValueError(f"Invalid formats: {formats!r}")
+
+    def textualize_batch(
+        self,
+        urls: List[str],
+        formats: Optional[List[str]] = None,
+        manifest: Optional[str] = None,
+        save_paths: Optional[List[Optional[str]]] = None,
+    ) -> List[BatchResult]:
+        """
+        Like textualize_post, but never raises for a single URL.
+
+        Each URL gets a BatchResult (in input order) holding either its
+        output or the exception it raised; the rest of the batch still runs.
+        Threads are fetched concurrently when max_workers > 1. ``formats``
+        works as in textualize_post.
+
+        With ``manifest`` (a file path), each URL's status, output files
+        and content hash are appended to it as the URL finishes. Running
+        again with the same manifest skips URLs already done (their
+        results have ``skipped`` set and no output) and retries failures.
+
+        ``save_paths`` gives each URL its own save path in place of
+        save_output_to (None to not save that URL); with ``formats`` each
+        format's extension is swapped in as usual.
+        """
+        self._check_formats(formats)
+        if save_paths is not None and len(save_paths) != len(urls):
+            raise ValueError("save_paths must have one path per URL")
+        self._start_batch()
+        written: set[str] = set()
+        if manifest is None:
+            return [
+                self._batch_result(url, result, written, stats=stats)
+                for url, (result, stats) in zip(
+                    urls, self._run_batch(urls, formats, save_paths)
                 )
-                posts_csv, comments_csv = self._format_csv_relational(
-                    post_id, dict[str, Any](pd), comments_list
+            ]
+        paths = save_paths or [None] * len(urls)
+        with Manifest(manifest) as log:
+            written = log.written_paths()
+            pending = [
+                (url, path)
+                for url, path in zip(urls, paths)
+                if not log.is_done(url)
+            ]
+            pending_urls = [url for url, _ in pending]
+            pending_paths = [path for _, path in pending]
+            fresh = {
+                url: self._batch_result(url, result, written, log, stats)
+                for url, (result, stats) in zip(
+                    pending_urls,
+                    self._run_batch(pending_urls, formats, pending_paths),
                 )
-                if self.save_output_to:
-                    base = self.save_output_to.rsplit(".", 1)[0] if "." in self.save_output_to else self.save_output_to
-                    with open(f"{base}_posts.csv", "w") as f:
-                        f.write(posts_csv)
-                    with open(f"{base}_comments.csv", "w") as f:
-                        f.write(comments_csv)
-                final_output = posts_csv
-            else:
-                text_post = (
-                    f"Title: {pd['title']}\nAuthor: {pd['author']}\n"
-                    f"Upvotes: {pd['upvotes']}\n"
+            }
+        return [
+            fresh.get(url)
+            or {"url": url, "output": None, "error": None, "skipped": True}
+            for url in urls
+        ]
+
+    def _batch_result(
+        self,
+        url: str,
+        result: Union[Rendered, Exception],
+        written: set[str],
+        manifest: Optional[Manifest] = None,
+        stats: Optional[ThreadStats] = None,
+    ) -> BatchResult:
+        """
+        Write a rendered thread's files and wrap it as a BatchResult,
+        recording the outcome in ``manifest`` when given and reporting
+        ``stats`` to on_stats.
+        """
+        if isinstance(result, Exception):
+            if manifest is not None:
+                manifest.record(url, [], error=result)
+            self._emit_stats(stats)
+            return {"url": url, "output": None, "error": result}
+        final_output, files = result
+        self._write_files(files, written, stats)
+        self._emit_stats(stats)
+        if manifest is not None:
+            paths = list(dict.fromkeys(path for path, _, _ in files))
+            manifest.record(url, paths, final_output)
+        return {"url": url, "output": final_output, "error": None}
+
+    def _listing_urls(
+        self,
+        name: str,
+        sort: str,
+        limit: Optional[int],
+        time_filter: str,
+    ) -> Iterator[str]:
+        """Thread URLs from a subreddit listing, fetched page by page."""
+        subreddit = self._praw_reddit.subreddit(name)
+        if sort == "top":
+            listing = subreddit.top(time_filter=time_filter, limit=limit)
+        elif sort in ("hot", "new"):
+            listing = getattr(subreddit, sort)(limit=limit)
+        else:
+            raise ValueError(f"Invalid sort: {sort!r}")
+        for submission in listing:
+            yield f"https://www.reddit.com{submission.permalink}"
+
+    def textualize_subreddit(
+        self,
+        name: str,
+        sort: Literal["hot", "top", "new"] = "hot",
+        limit: Optional[int] = 100,
+        time_filter: Literal[
+            "all", "day", "hour", "month", "week", "year"
+        ] = "all",
+    ) -> Iterator[BatchResult]:
+        """
+        Textualize the threads of a subreddit listing, yielding a
+        BatchResult per thread in listing order, as textualize_batch does.
+
+        Work is pipelined: up to 2 * max_workers threads are fetched and
+        rendered on the pool while earlier results are consumed, and the
+        next listing page is requested as soon as the current one runs
+        out. Only that window of results is held in memory, so ``limit``
+        can be large (Reddit serves up to about 1000 posts per listing;
+        None for all of them). ``time_filter`` applies to 'top' only.
+        """
+        self._start_batch()
+        # Listing pages count towards the batch, not any one URL
+        overhead = self._new_stats("")
+        urls = metrics.iterate(
+            self._listing_urls(name, sort, limit, time_filter), overhead
+        )
+        workers = max(1, self.max_workers or 1)
+        window = 2 * workers
+        written: set[str] = set()
+        pending: Deque[tuple[str, Future[Any]]] = deque()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # Pulling the next URL may fetch the next listing page; the
+            # pool keeps working on the threads already submitted meanwhile
+            for url in urls:
+                future = pool.submit(
+                    ratelimit.in_context(self._try_textualize_one), url
                 )
-                if pd["selftext"]:
-                    text_post += f"Body text: {pd['selftext']}\n"
-                text_comments = self._process_comments(thread.comments)
-                comment_header = (
-                    f"\n{pd['num_comments']} Comments:\n--------\n"
-                    if self.max_comment_depth != 0
-                    else ""
+                pending.append((url, future))
+                if len(pending) >= window:
+                    done_url, done = pending.popleft()
+                    result, stats = done.result()
+                    yield self._batch_result(
+                        done_url, result, written, stats=stats
+                    )
+            while pending:
+                done_url, done = pending.popleft()
+                result, stats = done.result()
+                yield self._batch_result(
+                    done_url, result, written, stats=stats
                 )
-                final_output = text_post + comment_header + text_comments
+        self._emit_stats(overhead, url=False)
 
-            if self.save_output_to and self.format != "csv_relational":
-                self._handle_output(final_output)
-            final_outputs.append(final_output)
+    def refresh(
+        self, url: str, snapshot: Union[str, CommentTable]
+    ) -> RefreshResult:
+        """
+        Re-capture a thread incrementally from an earlier snapshot.
 
-        if len(final_outputs) == 1:
-            return final_outputs[0]
-        return final_outputs
+        ``snapshot`` is a previous csv_relational comments CSV or jsonl
+        (jsonl_records='comment') file, or the ``table`` of an earlier
+        RefreshResult. The first page of the thread is fetched as usual,
+        but hidden comments already in the snapshot are not requested
+        again; the snapshot's copies are merged back into the tree. Edits
+        are detected for every comment that was fetched.
+
+        The merged thread is rendered (and saved) in the configured
+        format. The result also lists the IDs of new and edited comments
+        and holds the merged table to pass to the next refresh.
+        """
+        if isinstance(snapshot, str):
+            snapshot = load_snapshot(snapshot, self._submission_id(url))
+        thread, pd = self._fetch_thread(url, known_ids=set(snapshot.ids))
+        fetched = self._build_comment_table(thread.comments)
+        table, new_ids, edited_ids = merge(
+            snapshot, fetched, self._depth_limit()
+        )
+        output, files = self._render_table(thread.id, pd, table)
+        self._write_files(files, set())
+        return {
+            "url": url,
+            "output": output,
+            "new_comment_ids": new_ids,
+            "edited_comment_ids": edited_ids,
+            "table": table,
+        }
+
+    def iter_textualize(self, url: str) -> Iterator[str]:
+        """
+        Render one thread as a stream of text chunks.
+
+        The thread is fetched and expanded first; the output is then
+        produced piece by piece (chunks of roughly 64 KiB) instead of as
+        one string, so it can be sent or written while it is rendered.
+        Joining the chunks gives exactly what textualize_post returns.
+        save_output_to is ignored. Not available for 'csv_relational',
+        'parquet' or 'sqlite', which produce two tables.
+        """
+        if self.format in _RELATIONAL_FORMATS:
+            raise ValueError(
+                f"Streaming is not supported for format={self.format!r}"
+            )
+        return self._iter_output(*self._load_thread(url))
+
+    def textualize_to(self, url: str, fp: Any, encoding: str = "utf-8") -> int:
+        """
+        Render one thread incrementally into ``fp``.
+
+        ``fp`` may be a text file-like object, a binary one (chunks are
+        encoded with ``encoding``), or a socket. Returns the number of
+        characters written.
+        """
+        chunks = self.iter_textualize(url)
+        if hasattr(fp, "sendall"):
+            write = fp.sendall
+            binary = True
+        else:
+            write = fp.write
+            binary = isinstance(
+                fp, (io.RawIOBase, io.BufferedIOBase)
+            ) or "b" in getattr(fp, "mode", "")
+        written = 0
+        for chunk in chunks:
+            write(chunk.encode(encoding) if binary else chunk)
+            written += len(chunk)
+        return written
@@ -0,0 +1,96 @@
+"""
+Checkpoint manifest for long batch runs.
+
+The manifest is a JSON Lines file with one record per finished URL:
+its status ("done" or "failed"), the files written and a SHA-256 of
+the rendered output, or the error. Records are appended and flushed as
+each URL completes, so a crash loses at most the URLs in flight; on a
+re-run, URLs whose latest record is "done" are skipped and failed ones
+are tried again. Each record is a single append-mode write, so several
+processes can share one manifest.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Union
+
+from reddit2text.models import ManifestRecord
+
+
+def content_hash(output: Union[str, Dict[str, str]]) -> str:
+    """SHA-256 of a rendered output (formats in the order rendered)."""
+    sha = hashlib.sha256()
+    parts = output.values() if isinstance(output, dict) else [output]
+    for part in parts:
+        sha.update(part.encode("utf-8"))
+    return sha.hexdigest()
+
+
+class Manifest:
+    """Records of a run, keyed by URL; the latest record wins."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.records: Dict[str, ManifestRecord] = {}
+        line = "\n"
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        record: ManifestRecord = json.loads(line)
+                    except ValueError:
+                        continue  # line cut short by a crash
+                    self.records[record["url"]] = record
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND)
+        if not line.endswith("\n"):
+            # End the cut-short line so the next record starts on its own
+            os.write(self._fd, b"\n")
+
+    def __enter__(self) -> "Manifest":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def is_done(self, url: str) -> bool:
+        record = self.records.get(url)
+        return record is not None and record["status"] == "done"
+
+    def written_paths(self) -> set[str]:
+        """Files written for the URLs already done, so a resumed run
+        appends to them (jsonl) rather than starting them over."""
+        return {
+            path
+            for record in self.records.values()
+            if record["status"] == "done"
+            for path in record["paths"]
+        }
+
+    def record(
+        self,
+        url: str,
+        paths: List[str],
+        output: Union[str, Dict[str, str], None] = None,
+        error: Optional[Exception] = None,
+    ) -> ManifestRecord:
+        """Append the outcome of ``url``: its output, or the error."""
+        record: ManifestRecord = {
+            "url": url,
+            "status": "failed" if error is not None else "done",
+            "paths": paths,
+            "sha256": content_hash(output) if output is not None else None,
+            "error": (
+                f"{type(error).__name__}: {error}"
+                if error is not None
+                else None
+            ),
+        }
+        os.write(self._fd, (json.dumps(record) + "\n").encode("utf-8"))
+        self.records[url] = record
+        return record
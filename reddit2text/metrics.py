@@ -0,0 +1,140 @@
+"""
+Per-URL stats: time spent in each phase and HTTP request accounting.
+
+The stats of the URL being processed live in a context variable, so
+code deep in the pipeline (the rate limiter, comment expansion, and the
+pool threads that copy the context, see ratelimit.in_context) adds to
+them without having them passed along. Nothing is recorded while no
+stats are being collected.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Literal, Optional, Tuple, TypeVar
+
+from reddit2text.models import BatchStats, ThreadStats
+
+Phase = Literal["fetch_s", "expand_s", "traverse_s", "format_s", "write_s"]
+Counter = Literal[
+    "requests",
+    "retries",
+    "stubs_expanded",
+    "response_bytes",
+    "rate_limit_sleeps",
+    "rate_limit_sleep_s",
+]
+
+# Every ThreadStats field summed into BatchStats
+TOTALS: Tuple[Literal[Phase, Counter, "comments", "output_bytes"], ...] = (
+    "fetch_s",
+    "expand_s",
+    "traverse_s",
+    "format_s",
+    "write_s",
+    "comments",
+    "output_bytes",
+    "requests",
+    "retries",
+    "stubs_expanded",
+    "response_bytes",
+    "rate_limit_sleeps",
+    "rate_limit_sleep_s",
+)
+
+T = TypeVar("T")
+
+current: ContextVar[Optional[ThreadStats]] = ContextVar(
+    "reddit2text_stats", default=None
+)
+# Expansion updates one URL's stats from several pool threads
+_lock = threading.Lock()
+
+
+def new(url: str) -> ThreadStats:
+    return {
+        "url": url,
+        "fetch_s": 0.0,
+        "expand_s": 0.0,
+        "traverse_s": 0.0,
+        "format_s": 0.0,
+        "write_s": 0.0,
+        "comments": 0,
+        "output_bytes": 0,
+        "requests": 0,
+        "retries": 0,
+        "stubs_expanded": 0,
+        "response_bytes": 0,
+        "rate_limit_sleeps": 0,
+        "rate_limit_sleep_s": 0.0,
+        "error": None,
+    }
+
+
+def new_batch() -> BatchStats:
+    totals = new("")
+    return {
+        "urls": 0,
+        "failed": 0,
+        **{key: totals[key] for key in TOTALS},  # type: ignore[typeddict-item]
+    }
+
+
+def add(key: Counter, n: float = 1) -> None:
+    """Add ``n`` to a counter of the current URL, if collecting."""
+    stats = current.get()
+    if stats is not None:
+        with _lock:
+            stats[key] += n
+
+
+@contextmanager
+def phase(key: Phase) -> Iterator[None]:
+    """Add the time spent in the block to the current URL's stats."""
+    stats = current.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        with _lock:
+            stats[key] += elapsed
+
+
+@contextmanager
+def collect(stats: Optional[ThreadStats]) -> Iterator[None]:
+    """Record into ``stats`` inside the block (nothing when None)."""
+    token = current.set(stats)
+    try:
+        yield
+    finally:
+        current.reset(token)
+
+
+def iterate(items: Iterator[T], stats: Optional[ThreadStats]) -> Iterator[T]:
+    """Iterate ``items``, recording the work of each step into ``stats``."""
+    while True:
+        with collect(stats):
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+        yield item
+
+
+def merge(total: BatchStats, stats: ThreadStats, url: bool = True) -> None:
+    """
+    Add a URL's stats to a batch total. With ``url`` False, ``stats``
+    holds batch-level work (listing pages, header lookups) and is not
+    counted as a URL.
+    """
+    if url:
+        total["urls"] += 1
+        if stats["error"] is not None:
+            total["failed"] += 1
+    for key in TOTALS:
+        total[key] += stats[key]
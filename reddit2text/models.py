@@ -2,7 +2,18 @@
 
 from __future__ import annotations
 
-from typing import List, TypedDict
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import (
+    Dict,
+    List,
+    Literal,
+    NotRequired,
+    Optional,
+    TypedDict,
+    Union,
+)
 
 
 class PostData(TypedDict):
@@ -13,6 +24,8 @@ class PostData(TypedDict):
     upvotes: int
     selftext: str
     num_comments: int
+    # Only present (and True) when an expansion budget cut comments short
+    incomplete: NotRequired[bool]
 
 
 class CommentDict(TypedDict):
@@ -32,3 +45,147 @@ class ThreadJson(TypedDict):
 
     post: PostData
     comments: List[CommentDict]
+
+
+class Credentials(TypedDict):
+    """One Reddit API app, for Reddit2Text's credential pool."""
+
+    client_id: str
+    client_secret: str
+    user_agent: str
+
+
+class BatchResult(TypedDict):
+    """Outcome of one URL in a textualize_batch call."""
+
+    url: str
+    # A format -> output mapping when several formats were requested
+    output: Union[str, Dict[str, str], None]
+    error: Optional[Exception]
+    # Only present (and True) when a manifest showed the URL already done
+    skipped: NotRequired[bool]
+
+
+class ManifestRecord(TypedDict):
+    """One line of a batch manifest: how a URL's last attempt went."""
+
+    url: str
+    status: Literal["done", "failed"]
+    # Files written for the URL
+    paths: List[str]
+    # SHA-256 of the rendered output when done, None when failed
+    sha256: Optional[str]
+    # "ExceptionType: message" when failed, None when done
+    error: Optional[str]
+
+
+class ThreadStats(TypedDict):
+    """Where the time went for one URL, passed to Reddit2Text's on_stats."""
+
+    url: str
+    # Seconds spent fetching the submission, loading hidden comments,
+    # walking the comment tree, rendering and writing files
+    fetch_s: float
+    expand_s: float
+    traverse_s: float
+    format_s: float
+    write_s: float
+    comments: int
+    # UTF-8 size of the rendered output (all formats)
+    output_bytes: int
+    # HTTP requests sent (retries included), prawcore and failover
+    # retries, MoreComments stubs resolved, response body bytes, and
+    # waits for rate-limit quota
+    requests: int
+    retries: int
+    stubs_expanded: int
+    response_bytes: int
+    rate_limit_sleeps: int
+    rate_limit_sleep_s: float
+    # "Type: message" of the exception when the URL failed
+    error: Optional[str]
+
+
+class BatchStats(TypedDict):
+    """
+    ThreadStats summed over the URLs of one call, plus requests made for
+    the batch as a whole (listing pages, bulk header lookups).
+    """
+
+    urls: int
+    failed: int
+    fetch_s: float
+    expand_s: float
+    traverse_s: float
+    format_s: float
+    write_s: float
+    comments: int
+    output_bytes: int
+    requests: int
+    retries: int
+    stubs_expanded: int
+    response_bytes: int
+    rate_limit_sleeps: int
+    rate_limit_sleep_s: float
+
+
+class RefreshResult(TypedDict):
+    """Outcome of Reddit2Text.refresh."""
+
+    url: str
+    output: str
+    # Comments not in the snapshot, and snapshot comments whose body changed
+    new_comment_ids: List[str]
+    edited_comment_ids: List[str]
+    # The merged thread, usable as the next refresh's snapshot
+    table: CommentTable
+
+
+@dataclass
+class CommentTable:
+    """
+    A thread's comments flattened in pre-order (the order they are read
+    top to bottom), one row per comment across parallel lists.
+
+    ``parents[i]`` is the row index of comment i's parent, or -1 for a
+    top-level comment; parents always precede their replies. A reply
+    whose parent is not in the table (fetched for a comment that is only
+    in a refresh snapshot) also has -1, and its parent's comment ID in
+    ``orphan_parents``. Authors are
+    already resolved and bodies already have newlines collapsed, so every
+    output format renders from the table without touching PRAW objects.
+
+    Integer columns are packed C arrays and author names are interned, so
+    each distinct author is stored once. On 64-bit CPython a row costs
+    about 37 bytes beyond its id and body strings, against roughly 225
+    bytes for a dict per comment.
+    """
+
+    ids: List[str] = field(default_factory=list)
+    parents: array[int] = field(default_factory=lambda: array("i"))
+    depths: array[int] = field(default_factory=lambda: array("i"))
+    authors: List[str] = field(default_factory=list)
+    scores: array[int] = field(default_factory=lambda: array("i"))
+    bodies: List[str] = field(default_factory=list)
+    orphan_parents: Dict[int, str] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(
+        self,
+        comment_id: str,
+        parent: int,
+        depth: int,
+        author: str,
+        score: int,
+        body: str,
+    ) -> int:
+        """Add a row and return its index."""
+        self.ids.append(comment_id)
+        self.parents.append(parent)
+        self.depths.append(depth)
+        self.authors.append(sys.intern(author))
+        self.scores.append(score)
+        self.bodies.append(body)
+        return len(self.ids) - 1
@@ -0,0 +1,86 @@
+"""
+Parquet export of the relational posts/comments tables, built straight
+from the comment table's columns. Requires the ``parquet`` extra
+(pyarrow).
+"""
+
+from typing import Any
+
+from reddit2text.models import CommentTable, PostData
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - exercised only without the extra
+    pa = None
+    pq = None
+
+# Rows per row group in the comments file
+ROW_GROUP_SIZE = 64 * 1024
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError(
+            "format='parquet' requires pyarrow: "
+            "pip install reddit2text[parquet]"
+        )
+
+
+def _to_bytes(table: Any) -> bytes:
+    sink = pa.BufferOutputStream()
+    pq.write_table(
+        table,
+        sink,
+        row_group_size=ROW_GROUP_SIZE,
+        use_dictionary=["post_id", "author"],
+    )
+    data: bytes = sink.getvalue().to_pybytes()
+    return data
+
+
+def posts_parquet(post_id: str, post_data: PostData) -> bytes:
+    """The one-row posts table, with the csv_relational columns."""
+    _require_pyarrow()
+    table = pa.table(
+        {
+            "post_id": pa.array([post_id], pa.string()),
+            "title": pa.array([post_data["title"]], pa.string()),
+            "author": pa.array([post_data["author"]], pa.string()),
+            "upvotes": pa.array([post_data["upvotes"]], pa.int64()),
+            "selftext": pa.array([post_data["selftext"]], pa.string()),
+            "num_comments": pa.array([post_data["num_comments"]], pa.int64()),
+        }
+    )
+    return _to_bytes(table)
+
+
+def comments_parquet(post_id: str, comments: CommentTable) -> bytes:
+    """
+    The comments table, with the csv_relational columns.
+
+    ``author`` and ``post_id`` are stored dictionary-encoded, since a
+    handful of values repeat across every row.
+    """
+    _require_pyarrow()
+    ids = comments.ids
+    n = len(comments)
+    parent_ids = [
+        ids[parent] if parent != -1 else post_id for parent in comments.parents
+    ]
+    table = pa.table(
+        {
+            "comment_id": pa.array(ids, pa.string()),
+            "post_id": pa.array(
+                [post_id] * n, pa.string()
+            ).dictionary_encode(),
+            "parent_id": pa.array(parent_ids, pa.string()),
+            "depth": pa.array(comments.depths, pa.int32()),
+            "author": pa.array(
+                comments.authors, pa.string()
+            ).dictionary_encode(),
+            "score": pa.array(comments.scores, pa.int32()),
+            "body": pa.array(comments.bodies, pa.string()),
+        }
+    )
+    return _to_bytes(table)
@@ -0,0 +1,158 @@
+"""
+A pool of Reddit API credentials used as one client.
+
+Each credential gets its own prawcore session (and so its own access
+token) and its own RateLimitScheduler, since Reddit counts the quota
+per OAuth client. Every request goes to the healthy client with the
+most quota left in its window, so a crawl runs at the combined rate of
+the pool. A client that answers with an auth error or a 429 is put in
+cooldown and the request is retried on the next one; when every client
+is cooling down, the request waits for the first to come back.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Optional
+
+import praw
+from prawcore.exceptions import (
+    InvalidToken,
+    OAuthException,
+    ResponseException,
+    TooManyRequests,
+)
+
+from reddit2text import metrics
+from reddit2text.models import Credentials
+from reddit2text.ratelimit import RateLimitScheduler
+
+# Seconds a client sits out after an auth error, and after a 429 that
+# did not say how long to wait
+AUTH_COOLDOWN_S = 300.0
+RATE_COOLDOWN_S = 60.0
+
+
+@dataclass
+class PooledClient:
+    """One credential of a ClientPool and its health."""
+
+    client_id: str
+    session: Any
+    scheduler: RateLimitScheduler
+    requests: int = 0
+    errors: int = 0
+    # Failed requests since the last success
+    failures: int = 0
+    cooldown_until: float = 0.0
+    last_error: Optional[Exception] = field(default=None, repr=False)
+
+    def healthy(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        return now >= self.cooldown_until
+
+
+def _cooldown(exc: Exception) -> Optional[float]:
+    """Seconds to bench the client that raised ``exc``; None if it's not
+    the client's fault (not found, private subreddit, server error...)."""
+    if isinstance(exc, TooManyRequests):
+        try:
+            return float(exc.retry_after or RATE_COOLDOWN_S)
+        except ValueError:
+            return RATE_COOLDOWN_S
+    if isinstance(exc, (OAuthException, InvalidToken)):
+        return AUTH_COOLDOWN_S
+    if isinstance(exc, ResponseException):
+        status = exc.response.status_code
+        if status == 401:
+            return AUTH_COOLDOWN_S
+        if status == 429:
+            return RATE_COOLDOWN_S
+    return None
+
+
+class ClientPool:
+    """
+    Spread requests over several credentials. Installed on a praw.Reddit
+    (see ``install``), it stands in for the instance's prawcore session.
+    """
+
+    def __init__(self, clients: List[PooledClient]) -> None:
+        if not clients:
+            raise ValueError("ClientPool needs at least one credential")
+        self.clients = clients
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_credentials(cls, credentials: List[Credentials]) -> "ClientPool":
+        clients = []
+        for cred in credentials:
+            reddit = praw.Reddit(
+                client_id=cred["client_id"],
+                client_secret=cred["client_secret"],
+                user_agent=cred["user_agent"],
+            )
+            scheduler = RateLimitScheduler()
+            scheduler.install(reddit)
+            clients.append(
+                PooledClient(
+                    cred["client_id"], reddit._read_only_core, scheduler
+                )
+            )
+        return cls(clients)
+
+    def install(self, reddit: Any) -> None:
+        """Send every request of a praw.Reddit through the pool."""
+        reddit._core = reddit._read_only_core = self
+
+    def _pick(self, tried: List[PooledClient]) -> Optional[PooledClient]:
+        """The healthy client with the most quota to spare, or the one
+        back soonest if all are cooling down."""
+        now = time.monotonic()
+        candidates = [c for c in self.clients if c not in tried]
+        if not candidates:
+            return None
+        healthy = [c for c in candidates if c.healthy(now)]
+        if not healthy:
+            return min(candidates, key=lambda c: c.cooldown_until)
+        return max(
+            healthy, key=lambda c: (c.scheduler.headroom(), -c.requests)
+        )
+
+    def request(self, **kwargs: Any) -> Any:
+        """prawcore Session interface."""
+        tried: List[PooledClient] = []
+        while True:
+            with self._lock:
+                client = self._pick(tried)
+                if client is None:
+                    raise tried[-1].last_error  # type: ignore[misc]
+                client.requests += 1
+                wait = client.cooldown_until - time.monotonic()
+            if wait > 0:
+                # Every client is benched; wait for the first one back
+                metrics.add("rate_limit_sleeps")
+                metrics.add("rate_limit_sleep_s", wait)
+                time.sleep(wait)
+            if tried:
+                metrics.add("retries")  # failing over
+            tried.append(client)
+            try:
+                response = client.session.request(**kwargs)
+            except Exception as exc:
+                cooldown = _cooldown(exc)
+                with self._lock:
+                    client.errors += 1
+                    if cooldown is None:
+                        raise
+                    client.failures += 1
+                    client.last_error = exc
+                    client.cooldown_until = time.monotonic() + cooldown
+                continue
+            with self._lock:
+                client.failures = 0
+            return response
+
+    def close(self) -> None:
+        for client in self.clients:
+            client.session.close()
@@ -0,0 +1,188 @@
+"""
+A rate-limit scheduler shared by every thread that talks to Reddit.
+
+Reddit reports the request quota of the current window in the
+``x-ratelimit-remaining`` / ``-used`` / ``-reset`` headers of every
+response. prawcore paces each session on its own; this scheduler
+replaces that per-session limiter with one token bucket for all
+sessions and worker threads of a client: the bucket holds the quota
+left in the window (minus requests already in flight) and is refilled
+when the window resets. Requests go out back to back while quota
+remains, and wait for the reset once it is spent, so the limit is
+never tripped and no quota is left unused.
+
+Waiting requests are served by priority (higher first), then in
+arrival order. A job's priority is set with the ``priority`` context
+manager and follows its work onto worker threads.
+"""
+
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Mapping, Optional
+
+from prawcore.sessions import FiniteRetryStrategy
+
+from reddit2text import metrics
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "reddit2text_priority", default=0
+)
+
+
+@contextmanager
+def priority(level: int) -> Iterator[None]:
+    """Run the requests made inside the block at priority ``level``."""
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def in_context(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap ``fn`` to run in a copy of the caller's context, so a job's
+    priority carries over to the pool thread that runs it.
+    """
+    ctx = contextvars.copy_context()
+
+    def run(*args: Any) -> Any:
+        return ctx.copy().run(fn, *args)
+
+    return run
+
+
+class CountingRetryStrategy(FiniteRetryStrategy):
+    """prawcore's retry strategy, counting retries into the URL's stats."""
+
+    def consume_available_retry(self) -> FiniteRetryStrategy:
+        metrics.add("retries")
+        return super().consume_available_retry()
+
+
+class RateLimitScheduler:
+    """
+    Token bucket over Reddit's rate-limit window, usable as a prawcore
+    session's rate limiter (see ``install``).
+
+    Until the first response (or after a window resets) the quota is
+    unknown, so one probe request goes out at a time until the headers
+    report it.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        # Quota left in the window, net of requests in flight; None when
+        # unknown
+        self.remaining: Optional[float] = None
+        self.used: Optional[int] = None
+        self._reset_at = 0.0
+        self._in_flight = 0
+        self._waiters: List[tuple[int, int]] = []
+        self._seq = itertools.count()
+        # Requests sent and time spent waiting for quota, for reporting
+        self.requests = 0
+        self.waits = 0
+        self.waited_s = 0.0
+
+    def install(self, reddit: Any) -> None:
+        """Route every request of a praw.Reddit through this scheduler."""
+        for name in ("_read_only_core", "_authorized_core"):
+            core = getattr(reddit, name, None)
+            if core is not None:
+                core._rate_limiter = self
+                core._retry_strategy_class = CountingRetryStrategy
+
+    def _wait_time(self, now: float) -> Optional[float]:
+        """0 to go now, seconds to sleep, or None to wait for a response."""
+        if self.remaining is not None and now >= self._reset_at:
+            self.remaining = None  # new window, quota unknown again
+        if self.remaining is None:
+            return 0.0 if self._in_flight == 0 else None
+        if self.remaining >= 1:
+            return 0.0
+        return self._reset_at - now
+
+    def headroom(self) -> float:
+        """Requests that could be sent now without queueing."""
+        with self._cond:
+            self._wait_time(time.monotonic())
+            if self.remaining is None:
+                return 1.0 if self._in_flight == 0 else 0.0
+            return max(self.remaining - len(self._waiters), 0.0)
+
+    def acquire(self, level: Optional[int] = None) -> float:
+        """Block until a request may be sent; returns the seconds waited."""
+        me = (-(_priority.get() if level is None else level), next(self._seq))
+        with self._cond:
+            heapq.heappush(self._waiters, me)
+            started = time.monotonic()
+            try:
+                while True:
+                    wait = None
+                    if self._waiters[0] == me:
+                        wait = self._wait_time(time.monotonic())
+                        if wait is not None and wait <= 0:
+                            break
+                    self._cond.wait(wait)
+            except BaseException:
+                self._waiters.remove(me)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+                raise
+            heapq.heappop(self._waiters)
+            waited = time.monotonic() - started
+            if waited > 0.001:
+                self.waits += 1
+                self.waited_s += waited
+            else:
+                waited = 0.0
+            if self.remaining is not None:
+                self.remaining -= 1
+            self._in_flight += 1
+            self.requests += 1
+            self._cond.notify_all()
+        return waited
+
+    def release(self, headers: Optional[Mapping[str, str]] = None) -> None:
+        """Record a finished request and the quota its response reported."""
+        with self._cond:
+            self._in_flight -= 1
+            if headers is not None and "x-ratelimit-remaining" in headers:
+                self.remaining = (
+                    float(headers["x-ratelimit-remaining"]) - self._in_flight
+                )
+                self.used = int(float(headers.get("x-ratelimit-used", 0)))
+                self._reset_at = time.monotonic() + float(
+                    headers.get("x-ratelimit-reset", 0)
+                )
+            self._cond.notify_all()
+
+    def call(
+        self,
+        *,
+        method: str,
+        request_function: Callable[..., Any],
+        set_header_callback: Callable[[], Any],
+        url: str,
+        **kwargs: Any,
+    ) -> Any:
+        """prawcore RateLimiter interface."""
+        waited = self.acquire()
+        if waited:
+            metrics.add("rate_limit_sleeps")
+            metrics.add("rate_limit_sleep_s", waited)
+        metrics.add("requests")
+        headers = None
+        try:
+            kwargs["headers"] = set_header_callback()
+            response = request_function(method, url, **kwargs)
+            headers = response.headers
+            metrics.add("response_bytes", len(response.content))
+            return response
+        finally:
+            self.release(headers)
@@ -0,0 +1,204 @@
+"""
+Raw-JSON engine: fetch a thread's JSON listing through the authenticated
+PRAW session and parse it straight into compact records, skipping PRAW's
+Comment/Redditor object graph.
+
+The records expose the attributes the collectors read (``id``,
+``author``, ``score``, ``body``, ``replies``), so the same formatters
+render them. ``author`` is a plain string here (None when deleted)
+instead of a Redditor.
+"""
+
+import sys
+from typing import Any, Iterator, List, Optional, Union
+
+from praw.const import API_PATH
+from praw.models import Submission
+
+
+class RawComment:
+    """A comment parsed from JSON."""
+
+    __slots__ = ("id", "parent_id", "author", "score", "body", "replies")
+
+    def __init__(
+        self,
+        id: str,
+        parent_id: str,
+        author: Optional[str],
+        score: int,
+        body: str,
+    ) -> None:
+        self.id = id
+        self.parent_id = parent_id
+        self.author = author
+        self.score = score
+        self.body = body
+        self.replies: List[Union["RawComment", "RawMore"]] = []
+
+
+class RawMore:
+    """A "load more comments" / "continue this thread" stub."""
+
+    __slots__ = ("parent_id", "children", "count")
+
+    def __init__(
+        self, parent_id: str, children: List[str], count: int
+    ) -> None:
+        self.parent_id = parent_id
+        self.children = children
+        self.count = count
+
+
+class RawSubmission:
+    """The post fields the renderers read, plus its comment forest."""
+
+    __slots__ = (
+        "id",
+        "title",
+        "author",
+        "score",
+        "selftext",
+        "num_comments",
+        "comments",
+        "comment_sort",
+        "comment_limit",
+    )
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self.id: str = data["id"]
+        self.title: str = data["title"]
+        self.author = _author(data.get("author"))
+        self.score: int = data["score"]
+        self.selftext: str = data.get("selftext") or ""
+        self.num_comments: int = data["num_comments"]
+        self.comments: List[Union[RawComment, RawMore]] = []
+        self.comment_sort = "confidence"
+        self.comment_limit = 2048
+
+    @property
+    def fullname(self) -> str:
+        return f"t3_{self.id}"
+
+
+def _author(name: Optional[str]) -> Optional[str]:
+    # PRAW maps deleted authors to None; do the same. Interning keeps one
+    # copy of each name however many comments an author wrote.
+    return None if not name or name == "[deleted]" else sys.intern(name)
+
+
+def parse_thing(thing: dict[str, Any]) -> Union[RawComment, RawMore, None]:
+    """Parse one listing child (without its replies)."""
+    data = thing["data"]
+    if thing["kind"] == "more":
+        return RawMore(data["parent_id"], data["children"], data["count"])
+    if thing["kind"] != "t1":
+        return None
+    return RawComment(
+        data["id"],
+        data["parent_id"],
+        _author(data.get("author")),
+        data["score"],
+        data["body"],
+    )
+
+
+def parse_listing(
+    listing: dict[str, Any],
+) -> List[Union[RawComment, RawMore]]:
+    """Parse a nested comment Listing into a forest of records."""
+    out: List[Union[RawComment, RawMore]] = []
+    # Stack: (listing children, list to append parsed records to)
+    stack: List[tuple[List[dict[str, Any]], List[Any]]] = [
+        (listing["data"]["children"], out)
+    ]
+    while stack:
+        children, target = stack.pop()
+        for thing in children:
+            record = parse_thing(thing)
+            if record is None:
+                continue
+            target.append(record)
+            replies = thing["data"].get("replies")
+            if isinstance(record, RawComment) and replies:
+                stack.append((replies["data"]["children"], record.replies))
+    return out
+
+
+def fetch_submission(
+    reddit: Any, url: str, depth: Optional[int] = None
+) -> RawSubmission:
+    """Fetch a submission and its first page of comments as records."""
+    submission_id = Submission.id_from_url(url)
+    params: dict[str, Any] = {"limit": 2048, "sort": "confidence"}
+    if depth is not None:
+        params["depth"] = depth
+    submission_listing, comment_listing = reddit.request(
+        method="GET",
+        path=API_PATH["submission"].format(id=submission_id),
+        params=params,
+    )
+    thread = RawSubmission(submission_listing["data"]["children"][0]["data"])
+    thread.comments = parse_listing(comment_listing)
+    return thread
+
+
+def fetch_info(reddit: Any, fullnames: List[str]) -> Iterator[RawSubmission]:
+    """Resolve submissions via /api/info, 100 fullnames per request."""
+    for start in range(0, len(fullnames), 100):
+        end = start + 100
+        listing = reddit.request(
+            method="GET",
+            path=API_PATH["info"],
+            params={"id": ",".join(fullnames[start:end])},
+        )
+        for thing in listing["data"]["children"]:
+            if thing["kind"] == "t3":
+                yield RawSubmission(thing["data"])
+
+
+def fetch_morechildren(
+    reddit: Any,
+    submission: RawSubmission,
+    ids: List[str],
+    depth: Optional[int] = None,
+) -> List[Union[RawComment, RawMore]]:
+    """Resolve comment IDs via /api/morechildren; results come back flat."""
+    data = {
+        "api_type": "json",
+        "children": ",".join(ids),
+        "link_id": submission.fullname,
+        "sort": submission.comment_sort,
+    }
+    if depth is not None:
+        data["depth"] = str(depth)
+    response = reddit.request(
+        method="POST", path=API_PATH["morechildren"], data=data
+    )
+    out: List[Union[RawComment, RawMore]] = []
+    for thing in response["json"]["data"]["things"]:
+        record = parse_thing(thing)
+        if record is not None:
+            out.append(record)
+    return out
+
+
+def fetch_continuation(
+    reddit: Any,
+    submission: RawSubmission,
+    comment_id: str,
+    depth: Optional[int] = None,
+) -> List[Union[RawComment, RawMore]]:
+    """Fetch the replies of ``comment_id`` ("continue this thread")."""
+    path = f"{API_PATH['submission'].format(id=submission.id)}_/{comment_id}"
+    params: dict[str, Any] = {
+        "limit": submission.comment_limit,
+        "sort": submission.comment_sort,
+    }
+    if depth is not None:
+        params["depth"] = depth
+    _, comment_listing = reddit.request(method="GET", path=path, params=params)
+    roots = parse_listing(comment_listing)
+    if not roots or not isinstance(roots[0], RawComment):
+        return []
+    return roots[0].replies
@@ -0,0 +1,129 @@
+"""
+Snapshots of previously captured threads, for incremental refresh.
+
+A snapshot is the comment table of an earlier capture. It can be read
+back from the library's own relational outputs, which carry comment
+IDs: a csv_relational comments CSV or a jsonl file written with
+jsonl_records='comment'. (Nested json output has no IDs, so it cannot
+be matched against a fresh fetch.)
+"""
+
+import csv
+import json
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from reddit2text.models import CommentTable
+
+
+def _rows(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, newline="") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                record = json.loads(line)
+                if record.get("record") == "comment":
+                    yield record
+        else:
+            yield from csv.DictReader(f)
+
+
+def load_snapshot(path: str, post_id: str) -> CommentTable:
+    """Read the comments of ``post_id`` from a previous capture."""
+    table = CommentTable()
+    row_by_id: Dict[str, int] = {}
+    for row in _rows(path):
+        if row["post_id"] != post_id:
+            continue
+        comment_id = row["comment_id"]
+        row_by_id[comment_id] = table.append(
+            comment_id,
+            row_by_id.get(row["parent_id"], -1),
+            int(row["depth"]),
+            row["author"],
+            int(row["score"]),
+            row["body"],
+        )
+    return table
+
+
+def _children(
+    table: CommentTable, known: Set[str]
+) -> Dict[Optional[str], List[int]]:
+    """Rows of ``table`` by parent comment ID (None for top level)."""
+    kids: Dict[Optional[str], List[int]] = {}
+    for i, parent in enumerate(table.parents):
+        if parent != -1:
+            parent_id: Optional[str] = table.ids[parent]
+        else:
+            parent_id = table.orphan_parents.get(i)
+            if parent_id not in known:
+                parent_id = None
+        kids.setdefault(parent_id, []).append(i)
+    return kids
+
+
+def merge(
+    old: CommentTable, new: CommentTable, max_depth: Optional[int] = None
+) -> tuple[CommentTable, List[str], List[str]]:
+    """
+    Merge a fresh (partial) fetch into a snapshot.
+
+    Comments in ``new`` win and keep the order Reddit returned them in;
+    snapshot comments missing from ``new`` (left behind in stubs that
+    were not re-requested) go back right after the sibling they followed
+    in the snapshot, so a refresh comes out in the same order as a full
+    re-capture. Fresh replies to a comment that is only in the snapshot
+    (``new.orphan_parents``) go under it. Returns the merged table and
+    the IDs of new and of edited comments.
+    """
+    fresh = set(new.ids)
+    known = fresh.union(old.ids)
+    fresh_kids = _children(new, known)
+    snapshot_kids = _children(old, known)
+
+    # Children of each comment ID (None for top level) as (table, row)
+    kids: Dict[Optional[str], List[tuple[CommentTable, int]]] = {}
+    for parent_id in fresh_kids.keys() | snapshot_kids.keys():
+        fetched = fresh_kids.get(parent_id, [])
+        fetched_rows = {new.ids[i]: i for i in fetched}
+        # Snapshot-only rows, keyed by the fetched sibling they follow
+        after: Dict[Optional[int], List[int]] = {}
+        anchor = None
+        for i in snapshot_kids.get(parent_id, []):
+            comment_id = old.ids[i]
+            if comment_id in fetched_rows:
+                anchor = fetched_rows[comment_id]
+            elif comment_id not in fresh:
+                after.setdefault(anchor, []).append(i)
+        ordered = [(old, i) for i in after.get(None, [])]
+        for i in fetched:
+            ordered.append((new, i))
+            ordered.extend((old, j) for j in after.get(i, []))
+        kids[parent_id] = ordered
+
+    merged = CommentTable()
+    stack: List[tuple[CommentTable, int, int, int]] = [
+        (src, i, -1, 1) for src, i in reversed(kids.get(None, []))
+    ]
+    while stack:
+        src, i, parent_row, depth = stack.pop()
+        if max_depth is not None and depth > max_depth:
+            continue
+        row = merged.append(
+            src.ids[i],
+            parent_row,
+            depth,
+            src.authors[i],
+            src.scores[i],
+            src.bodies[i],
+        )
+        for child_src, j in reversed(kids.get(src.ids[i], [])):
+            stack.append((child_src, j, row, depth + 1))
+
+    old_body = dict(zip(old.ids, old.bodies))
+    new_ids = [c for c in new.ids if c not in old_body]
+    edited_ids = [
+        c
+        for c, body in zip(new.ids, new.bodies)
+        if c in old_body and old_body[c] != body
+    ]
+    return merged, new_ids, edited_ids
@@ -0,0 +1,107 @@
+"""
+SQLite sink for the relational posts/comments tables (the csv_relational
+schema), written with upserts so re-running a batch updates rows in
+place.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from reddit2text.models import CommentTable, PostData
+
+SCHEMA = """
+PRAGMA journal_mode = WAL;
+CREATE TABLE IF NOT EXISTS posts (
+    post_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    author TEXT NOT NULL,
+    upvotes INTEGER NOT NULL,
+    selftext TEXT NOT NULL,
+    num_comments INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS comments (
+    comment_id TEXT PRIMARY KEY,
+    post_id TEXT NOT NULL REFERENCES posts (post_id),
+    parent_id TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    author TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    body TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS comments_post_id ON comments (post_id);
+CREATE INDEX IF NOT EXISTS comments_parent_id ON comments (parent_id);
+"""
+
+_UPSERT_POST = """
+INSERT INTO posts (post_id, title, author, upvotes, selftext, num_comments)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (post_id) DO UPDATE SET
+    title = excluded.title,
+    author = excluded.author,
+    upvotes = excluded.upvotes,
+    selftext = excluded.selftext,
+    num_comments = excluded.num_comments
+"""
+
+_UPSERT_COMMENT = """
+INSERT INTO comments
+    (comment_id, post_id, parent_id, depth, author, score, body)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (comment_id) DO UPDATE SET
+    post_id = excluded.post_id,
+    parent_id = excluded.parent_id,
+    depth = excluded.depth,
+    author = excluded.author,
+    score = excluded.score,
+    body = excluded.body
+"""
+
+
+@dataclass
+class ThreadRows:
+    """One rendered thread, stored once the batch reaches the writer."""
+
+    post_id: str
+    post_data: PostData
+    comments: CommentTable
+
+
+def _comment_rows(post_id: str, table: CommentTable) -> Iterator[Any]:
+    ids = table.ids
+    for i, parent in enumerate(table.parents):
+        yield (
+            ids[i],
+            post_id,
+            ids[parent] if parent != -1 else post_id,
+            table.depths[i],
+            table.authors[i],
+            table.scores[i],
+            table.bodies[i],
+        )
+
+
+def write_thread(path: str, rows: ThreadRows) -> None:
+    """Upsert one thread into the database at ``path``, in one transaction."""
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(SCHEMA)
+        pd = rows.post_data
+        with conn:
+            conn.execute(
+                _UPSERT_POST,
+                (
+                    rows.post_id,
+                    pd["title"],
+                    pd["author"],
+                    pd["upvotes"],
+                    pd["selftext"],
+                    pd["num_comments"],
+                ),
+            )
+            # executemany pulls rows from the generator in one statement
+            conn.executemany(
+                _UPSERT_COMMENT, _comment_rows(rows.post_id, rows.comments)
+            )
+    finally:
+        conn.close()
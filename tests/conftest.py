@@ -68,6 +68,10 @@ class FakeSubmission:
         self.selftext = selftext
         self.num_comments = num_comments
         self._comments = comments
+        self.fetch_params: dict[str, Any] = {}
+
+    def add_fetch_param(self, key: str, value: Any) -> None:
+        self.fetch_params[key] = value
 
     @property
     def comments(self) -> "FakeCommentForest":
@@ -0,0 +1,203 @@
+"""Tests for the asyncio front end (AsyncReddit2Text)."""
+
+import asyncio
+import json
+from typing import Any
+
+import pytest
+
+pytest.importorskip("asyncpraw")
+
+from asyncpraw.models import MoreComments  # noqa: E402
+
+from reddit2text.aio import AsyncReddit2Text  # noqa: E402
+
+
+class _AsyncForest:
+    """Wraps a FakeCommentForest with an awaitable replace_more."""
+
+    def __init__(self, forest: Any) -> None:
+        self._forest = forest
+        self._comments = forest._comments
+        self.replace_more_calls = 0
+        self.requests = 0
+
+    async def replace_more(self, limit: int | None = None) -> list[Any]:
+        # One request per stub still in the tree; resolve them to nothing
+        self.replace_more_calls += 1
+        queue = [self._comments]
+        while queue:
+            container = queue.pop()
+            stubs = [c for c in container if isinstance(c, MoreComments)]
+            self.requests += len(stubs)
+            container[:] = [c for c in container if c not in stubs]
+            queue.extend(c.replies for c in container)
+        return []
+
+    def __iter__(self) -> Any:
+        return iter(self._forest)
+
+
+class _AsyncSubmission:
+    """Proxies a FakeSubmission, swapping in an _AsyncForest."""
+
+    def __init__(self, submission: Any) -> None:
+        self._submission = submission
+        self.comments = _AsyncForest(submission.comments)
+
+    async def load(self) -> None:
+        pass
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._submission, name)
+
+
+class _FakeAsyncReddit:
+    def __init__(self, by_url: dict[str, Any]) -> None:
+        self._by_url = by_url
+        self.in_flight = 0
+        self.peak = 0
+        self.closed = False
+        self.fetched: list[_AsyncSubmission] = []
+
+    async def submission(self, url: str, fetch: bool = True) -> Any:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        if url not in self._by_url:
+            raise RuntimeError(f"unknown {url}")
+        submission = _AsyncSubmission(self._by_url[url])
+        self.fetched.append(submission)
+        return submission
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def _make(fake_reddit: _FakeAsyncReddit, **kwargs: Any) -> AsyncReddit2Text:
+    r = AsyncReddit2Text(
+        client_id="id",
+        client_secret="secret",
+        user_agent="ua",
+        **kwargs,
+    )
+    r._praw_reddit = fake_reddit
+    return r
+
+
+class TestAsyncTextualize:
+    """atextualize_post / atextualize_batch."""
+
+    def test_single_url_returns_string(self, fake_submission: Any) -> None:
+        r = _make(_FakeAsyncReddit({"a": fake_submission}))
+        out = asyncio.run(r.atextualize_post("a"))
+        assert isinstance(out, str)
+        assert "Sample post title" in out
+        assert "A reply to the first comment." in out
+
+    def test_json_format_matches_sync_shape(
+        self, fake_submission: Any
+    ) -> None:
+        r = _make(_FakeAsyncReddit({"a": fake_submission}), format="json")
+        data = json.loads(asyncio.run(r.atextualize_post("a")))
+        assert data["comments"][0]["replies"][0]["author"] == "commenter_two"
+
+    def test_gather_respects_concurrency_cap(
+        self, fake_submission: Any, minimal_fake_submission: Any
+    ) -> None:
+        fake_reddit = _FakeAsyncReddit(
+            {"a": fake_submission, "b": minimal_fake_submission}
+        )
+        r = _make(fake_reddit, max_concurrency=2)
+        urls = ["a", "b"] * 5
+        out = asyncio.run(r.atextualize_post(urls))
+        assert fake_reddit.peak <= 2
+        assert "Sample post title" in out[0]
+        assert "Title only" in out[1]
+
+    def test_batch_reports_failures(self, fake_submission: Any) -> None:
+        r = _make(_FakeAsyncReddit({"a": fake_submission}))
+        results = asyncio.run(r.atextualize_batch(["a", "missing", "a"]))
+        assert results[0]["error"] is None
+        assert isinstance(results[1]["error"], RuntimeError)
+        assert results[2]["output"] == results[0]["output"]
+
+    def test_depth_limit_skips_stubs_below_the_cut(
+        self, fake_submission: Any
+    ) -> None:
+        def stub(parent: str) -> MoreComments:
+            data = {"count": 0, "children": [], "parent_id": parent}
+            return MoreComments(None, {**data, "id": "_"})
+
+        first, second = fake_submission._comments
+        # A "load more" at the top level, and "continue this thread"
+        # links where a depth-1 fetch would cut the tree
+        fake_submission._comments.append(stub("t3_post"))
+        first.replies.append(stub("t1_c0"))
+        second.replies.append(stub("t1_c1"))
+        fake_reddit = _FakeAsyncReddit({"a": fake_submission})
+        r = _make(fake_reddit, max_comment_depth=1)
+        asyncio.run(r.atextualize_post("a"))
+        assert fake_reddit.fetched[0].comments.requests == 1
+        assert fake_submission.fetch_params == {"depth": 1}
+
+    def test_expand_timeout_marks_incomplete(
+        self, fake_submission: Any, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        async def slow(self: Any, limit: int | None = None) -> list[Any]:
+            await asyncio.sleep(1)
+            return []
+
+        monkeypatch.setattr(_AsyncForest, "replace_more", slow)
+        r = _make(
+            _FakeAsyncReddit({"a": fake_submission}),
+            format="json",
+            expand_timeout_s=0.01,
+        )
+        data = json.loads(asyncio.run(r.atextualize_post("a")))
+        assert data["post"]["incomplete"] is True
+
+    def test_async_context_manager_closes_client(self) -> None:
+        fake_reddit = _FakeAsyncReddit({})
+
+        async def run() -> None:
+            async with _make(fake_reddit):
+                pass
+
+        asyncio.run(run())
+        assert fake_reddit.closed
+
+
+class TestSyncApi:
+    """Inherited blocking methods and sync-only options are refused."""
+
+    @pytest.mark.parametrize(
+        "method",
+        [
+            "textualize_post",
+            "textualize_batch",
+            "textualize_subreddit",
+            "iter_textualize",
+            "textualize_to",
+            "refresh",
+        ],
+    )
+    def test_blocking_methods_raise(self, method: str) -> None:
+        r = _make(_FakeAsyncReddit({}))
+        with pytest.raises(TypeError, match="not available"):
+            getattr(r, method)("a")
+
+    @pytest.mark.parametrize(
+        "option,value",
+        [
+            ("rate_limiter", object()),
+            ("thread_cache_size", 2),
+            ("on_stats", print),
+            ("collect_stats", True),
+            ("max_comments", 10),
+        ],
+    )
+    def test_sync_only_options_rejected(self, option: str, value: Any) -> None:
+        with pytest.raises(ValueError, match=option):
+            _make(_FakeAsyncReddit({}), **{option: value})
@@ -0,0 +1,224 @@
+"""Tests for the on-disk response cache and the in-memory thread cache."""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import praw
+
+from reddit2text.cache import CachedReddit, ResponseCache, ThreadCache
+from reddit2text.main import Reddit2Text
+from reddit2text.models import CommentTable
+
+
+def _listing(archived: bool) -> list[Any]:
+    post = {"kind": "t3", "data": {"id": "abc", "archived": archived}}
+    return [
+        {"data": {"children": [post]}},
+        {"data": {"children": []}},
+    ]
+
+
+class TestResponseCache:
+    """TTL, archived posts and size-bounded LRU eviction."""
+
+    def test_round_trip_and_ttl(self, tmp_path: Path) -> None:
+        cache = ResponseCache(str(tmp_path), ttl_s=60)
+        cache.put("abc", "k", _listing(False))
+        assert cache.get("abc", "k") == _listing(False)
+        assert cache.get("abc", "other") is None
+        with patch(
+            "reddit2text.cache.time.time", return_value=time.time() + 61
+        ):
+            assert cache.get("abc", "k") is None
+
+    def test_archived_posts_never_expire(self, tmp_path: Path) -> None:
+        cache = ResponseCache(str(tmp_path), ttl_s=60)
+        cache.put("abc", "k", _listing(True))
+        cache.put("abc", "more", {"json": {}})
+        later = time.time() + 10**6
+        with patch("reddit2text.cache.time.time", return_value=later):
+            assert cache.get("abc", "k") == _listing(True)
+            assert cache.get("abc", "more") == {"json": {}}
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        cache = ResponseCache(str(tmp_path), max_bytes=2500)
+        body = "x" * 1000
+        cache.put("a", "k", body)
+        cache.put("b", "k", body)
+        # Make "a" the most recently used entry
+        past = time.time() - 100
+        os.utime(tmp_path / "b-k.json", (past, past))
+        assert cache.get("a", "k") == body
+        cache.put("c", "k", body)
+        assert cache.get("b", "k") is None
+        assert cache.get("a", "k") == body
+        assert cache.get("c", "k") == body
+
+
+class TestCachedReddit:
+    """Only comment-tree requests are cached."""
+
+    def test_repeat_request_served_from_disk(self, tmp_path: Path) -> None:
+        reddit = CachedReddit(
+            ResponseCache(str(tmp_path)),
+            client_id="id",
+            client_secret="secret",
+            user_agent="ua",
+        )
+        with patch.object(
+            praw.Reddit, "request", return_value=_listing(False)
+        ) as request:
+            for _ in range(2):
+                out = reddit.request(
+                    method="GET",
+                    path="comments/abc/",
+                    params={"limit": 2048, "sort": "confidence"},
+                )
+            assert out == _listing(False)
+            assert request.call_count == 1
+            reddit.request(
+                method="POST",
+                path="api/morechildren/",
+                data={"link_id": "t3_abc", "children": "x,y"},
+            )
+            reddit.request(
+                method="POST",
+                path="api/morechildren/",
+                data={"link_id": "t3_abc", "children": "x,y"},
+            )
+            assert request.call_count == 2
+            reddit.request(method="GET", path="api/v1/me")
+            reddit.request(method="GET", path="api/v1/me")
+            assert request.call_count == 4
+
+    def test_morechildren_key_ignores_api_type(self) -> None:
+        data = {"link_id": "t3_abc", "children": "x,y", "sort": "top"}
+        assert ResponseCache.key(
+            "POST", "api/morechildren/", None, data
+        ) == ResponseCache.key(
+            "POST", "api/morechildren/", None, {**data, "api_type": "json"}
+        )
+
+    def test_reddit2text_uses_cache_and_keeps_depth(
+        self, tmp_path: Path, fake_submission: Any
+    ) -> None:
+        r = Reddit2Text(
+            client_id="id",
+            client_secret="secret",
+            user_agent="ua",
+            cache_dir=str(tmp_path),
+            max_comment_depth=2,
+        )
+        assert isinstance(r._praw_reddit, CachedReddit)
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            r.textualize_post("https://redd.it/abc")
+        # The depth goes into the request, and so into the cache key
+        assert fake_submission.fetch_params == {"depth": "2"}
+
+
+class TestThreadCache:
+    """In-memory LRU of fetched threads on Reddit2Text."""
+
+    URL = "https://www.reddit.com/r/fake/comments/abc123/title/"
+
+    def _r2t(self, **kwargs: Any) -> Reddit2Text:
+        return Reddit2Text(
+            client_id="id",
+            client_secret="secret",
+            user_agent="ua",
+            thread_cache_size=2,
+            **kwargs,
+        )
+
+    def test_second_render_skips_fetch(self, fake_submission: Any) -> None:
+        r = self._r2t()
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            txt = r.textualize_post(self.URL)
+            r.format = "json"
+            out = r.textualize_post("https://redd.it/abc123")
+        assert mock_reddit.submission.call_count == 1
+        assert "Sample post title" in txt
+        assert '"post"' in out
+
+    def test_depth_change_is_a_separate_entry(
+        self, fake_submission: Any
+    ) -> None:
+        r = self._r2t()
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            r.textualize_post(self.URL)
+            r.max_comment_depth = 1
+            r.textualize_post(self.URL)
+        assert mock_reddit.submission.call_count == 2
+
+    def test_invalidate_refetches(self, fake_submission: Any) -> None:
+        r = self._r2t()
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            r.textualize_post(self.URL)
+            r.invalidate(self.URL)
+            r.textualize_post(self.URL)
+            r.invalidate()
+            r.textualize_post(self.URL)
+        assert mock_reddit.submission.call_count == 3
+
+    def test_incomplete_thread_not_cached(self, fake_submission: Any) -> None:
+        r = self._r2t()
+
+        def fetch(url: str, known_ids: Any = None) -> Any:
+            pd = r._build_post_data(fake_submission)
+            pd["incomplete"] = True  # e.g. expand_timeout_s ran out
+            return fake_submission, pd
+
+        with patch.object(r, "_fetch_thread", side_effect=fetch) as fetched:
+            r._load_thread(self.URL)
+            r._load_thread(self.URL)
+        assert fetched.call_count == 2
+        assert r._thread_cache is not None
+        assert len(r._thread_cache) == 0
+
+    def test_concurrent_loads_fetch_once(self, fake_submission: Any) -> None:
+        r = self._r2t()
+
+        def fetch(url: str, known_ids: Any = None) -> Any:
+            time.sleep(0.05)
+            return fake_submission, r._build_post_data(fake_submission)
+
+        with patch.object(r, "_fetch_thread", side_effect=fetch) as fetched:
+            threads = [
+                threading.Thread(target=r._load_thread, args=(self.URL,))
+                for _ in range(4)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        assert fetched.call_count == 1
+        assert r._thread_cache is not None
+        assert r._thread_cache._loading == {}
+
+    def test_bounds(self) -> None:
+        def entry(n: int) -> Any:
+            table = CommentTable()
+            for i in range(n):
+                table.append(str(i), -1, 1, "a", 1, "b")
+            return ("p", {}, table)
+
+        cache = ThreadCache(2, max_comments=5)
+        cache.put(("a",), entry(2))
+        cache.put(("b",), entry(2))
+        cache.get(("a",))
+        cache.put(("c",), entry(2))
+        assert cache.get(("b",)) is None  # least recently used
+        cache.put(("d",), entry(3))
+        # Evicting "a" satisfies both bounds (two entries, five comments)
+        assert cache.get(("a",)) is None
+        assert len(cache) == 2
+        cache.put(("e",), entry(6))  # larger than the whole budget
+        assert cache.get(("e",)) is None
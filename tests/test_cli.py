@@ -0,0 +1,120 @@
+"""Tests for the reddit2text command."""
+
+import io
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from reddit2text import cli
+
+
+@pytest.fixture(autouse=True)
+def _env_credentials(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("REDDIT_CLIENT_ID", "id")
+    monkeypatch.setenv("REDDIT_CLIENT_SECRET", "secret")
+    monkeypatch.setenv("REDDIT_USER_AGENT", "ua")
+
+
+class TestCli:
+    """URL input, templated outputs, stats and exit status."""
+
+    def test_writes_templated_paths_and_reports_failures(
+        self,
+        fake_submission: Any,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        monkeypatch.setattr(
+            "sys.stdin",
+            io.StringIO(
+                "# threads\n"
+                "https://reddit.com/r/fake/comments/post/title/\n"
+                "\n"
+                "https://reddit.com/r/fake/comments/gone/title/\n"
+            ),
+        )
+        reddit = MagicMock()
+        reddit.submission.side_effect = [fake_submission, ValueError("gone")]
+        template = str(tmp_path / "out" / "{index}-{id}.{ext}")
+        with patch("reddit2text.main.praw.Reddit", return_value=reddit):
+            code = cli.main(["-p", "1", "-f", "json", "-o", template])
+
+        assert code == 1
+        out = tmp_path / "out" / "0-post.json"
+        assert "Sample post title" in out.read_text()
+        err = capsys.readouterr().err
+        assert "failed: https://reddit.com/r/fake/comments/gone/title/" in err
+        assert "1 threads (1 failed, 0 already done), 3 comments" in err
+        assert "threads/s" in err
+
+    def test_manifest_skips_finished_urls(
+        self,
+        fake_submission: Any,
+        tmp_path: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        urls = tmp_path / "urls.txt"
+        urls.write_text("https://reddit.com/r/fake/comments/post/title/\n")
+        args = [
+            str(urls),
+            "-p",
+            "1",
+            "-o",
+            str(tmp_path / "{id}.{ext}"),
+            "--manifest",
+            str(tmp_path / "run.jsonl"),
+        ]
+        reddit = MagicMock()
+        reddit.submission.return_value = fake_submission
+        with patch("reddit2text.main.praw.Reddit", return_value=reddit):
+            assert cli.main(args) == 0
+            assert cli.main(args) == 0
+        assert reddit.submission.call_count == 1
+        assert (
+            "0 threads (0 failed, 1 already done)" in capsys.readouterr().err
+        )
+
+    def test_resume_keeps_index_of_each_url(
+        self, fake_submission: Any, tmp_path: Path
+    ) -> None:
+        urls = tmp_path / "urls.txt"
+        urls.write_text(
+            "https://reddit.com/r/fake/comments/post/title/\n"
+            "https://reddit.com/r/fake/comments/gone/title/\n"
+        )
+        args = [
+            str(urls),
+            "-p",
+            "1",
+            "-f",
+            "json",
+            "-o",
+            str(tmp_path / "{index}.{ext}"),
+            "--manifest",
+            str(tmp_path / "run.jsonl"),
+        ]
+        reddit = MagicMock()
+        reddit.submission.side_effect = [fake_submission, ValueError("gone")]
+        with patch("reddit2text.main.praw.Reddit", return_value=reddit):
+            assert cli.main(args) == 1
+            assert not (tmp_path / "1.json").exists()
+            reddit.submission.side_effect = [fake_submission]
+            assert cli.main(args) == 0
+        # The retried URL is still the second one
+        assert (tmp_path / "1.json").exists()
+
+    def test_rejects_template_shared_by_every_thread(self) -> None:
+        assert cli.main(["-o", "out.txt", "-"]) == 2
+
+    def test_credentials_dealt_out_across_processes(self) -> None:
+        creds = [{"client_id": str(i)} for i in range(4)]
+        shards = [cli._shard_settings({}, creds, i, 2) for i in range(2)]
+        assert [s["credentials"] for s in shards] == [
+            [creds[0], creds[2]],
+            [creds[1], creds[3]],
+        ]
+        # Fewer apps than processes: every process uses the whole pool
+        assert cli._shard_settings({}, creds, 0, 8)["credentials"] == creds
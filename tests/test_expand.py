@@ -0,0 +1,293 @@
+"""Tests for batched MoreComments expansion (reddit2text.expand)."""
+
+from typing import Any
+from unittest.mock import MagicMock
+
+import praw
+import pytest
+from praw.models.comment_forest import CommentForest
+
+from reddit2text import metrics
+from reddit2text.expand import expand_comments
+
+
+@pytest.fixture
+def reddit() -> praw.Reddit:
+    return praw.Reddit(
+        client_id="test_id",
+        client_secret="test_secret",
+        user_agent="test_agent",
+    )
+
+
+def _comment(reddit: praw.Reddit, cid: str, parent: str) -> Any:
+    return praw.models.Comment(
+        reddit,
+        _data={
+            "id": cid,
+            "name": f"t1_{cid}",
+            "parent_id": parent,
+            "author": f"user_{cid}",
+            "body": f"body {cid}",
+            "score": 1,
+            "replies": "",
+        },
+    )
+
+
+def _more(
+    reddit: praw.Reddit, parent: str, children: list[str], count: int = -1
+) -> Any:
+    return praw.models.MoreComments(
+        reddit,
+        {
+            "count": len(children) if count < 0 else count,
+            "children": children,
+            "parent_id": parent,
+            "id": children[0] if children else "_",
+            "name": f"t1_{children[0]}" if children else "t1__",
+        },
+    )
+
+
+def _submission(reddit: praw.Reddit, comments: list[Any]) -> Any:
+    submission = praw.models.Submission(reddit, id="post")
+    submission._comments = CommentForest(submission, [])
+    submission._comments._update(comments)
+    return submission
+
+
+def _flatten(forest: Any, depth: int = 1) -> list[tuple[int, str]]:
+    out: list[tuple[int, str]] = []
+    for c in forest:
+        assert not isinstance(c, praw.models.MoreComments)
+        out.append((depth, c.id))
+        out.extend(_flatten(c.replies, depth + 1))
+    return out
+
+
+class TestExpandComments:
+    """Stubs are resolved in batches and stitched in place."""
+
+    def test_stubs_share_one_request_and_keep_order(
+        self, reddit: praw.Reddit
+    ) -> None:
+        a = _comment(reddit, "a", "t3_post")
+        submission = _submission(
+            reddit, [a, _more(reddit, "t3_post", ["b", "c"])]
+        )
+        x = _comment(reddit, "x", "t1_a")
+        x.submission = submission
+        a.replies._comments.extend([x, _more(reddit, "t1_a", ["d"])])
+        api = MagicMock()
+        api.post.return_value = [
+            _comment(reddit, "d", "t1_a"),
+            _comment(reddit, "b", "t3_post"),
+            _comment(reddit, "b1", "t1_b"),
+            _comment(reddit, "c", "t3_post"),
+        ]
+
+        expand_comments(submission, api)
+
+        assert api.post.call_count == 1
+        ids = set(api.post.call_args.kwargs["data"]["children"].split(","))
+        assert ids == {"b", "c", "d"}
+        assert _flatten(submission.comments) == [
+            (1, "a"),
+            (2, "x"),
+            (2, "d"),
+            (1, "b"),
+            (2, "b1"),
+            (1, "c"),
+        ]
+
+    def test_large_stub_split_into_batches_of_100(
+        self, reddit: praw.Reddit
+    ) -> None:
+        children = [f"k{i}" for i in range(250)]
+        submission = _submission(reddit, [_more(reddit, "t3_post", children)])
+        api = MagicMock()
+
+        def post(path: str, data: dict[str, str]) -> list[Any]:
+            return [
+                _comment(reddit, cid, "t3_post")
+                for cid in data["children"].split(",")
+            ]
+
+        api.post.side_effect = post
+
+        expand_comments(submission, api)
+
+        assert api.post.call_count == 3
+        assert [c.id for c in submission.comments] == children
+
+    def test_new_stubs_are_resolved_in_later_rounds(
+        self, reddit: praw.Reddit
+    ) -> None:
+        submission = _submission(reddit, [_more(reddit, "t3_post", ["a"])])
+        api = MagicMock()
+        api.post.side_effect = [
+            [
+                _comment(reddit, "a", "t3_post"),
+                _more(reddit, "t3_post", ["b"]),
+            ],
+            [_comment(reddit, "b", "t3_post")],
+        ]
+
+        expand_comments(submission, api)
+
+        assert [c.id for c in submission.comments] == ["a", "b"]
+
+    def test_expanded_stubs_are_counted(self, reddit: praw.Reddit) -> None:
+        submission = _submission(reddit, [_more(reddit, "t3_post", ["a"])])
+        api = MagicMock()
+        api.post.side_effect = [
+            [
+                _comment(reddit, "a", "t3_post"),
+                _more(reddit, "t3_post", ["b"]),
+            ],
+            [_comment(reddit, "b", "t3_post")],
+        ]
+        stats = metrics.new("url")
+
+        with metrics.collect(stats):
+            expand_comments(submission, api)
+
+        assert stats["stubs_expanded"] == 2
+
+    def test_continue_this_thread_stub(self, reddit: praw.Reddit) -> None:
+        a = _comment(reddit, "a", "t3_post")
+        submission = _submission(reddit, [a])
+        a.replies._comments.append(_more(reddit, "t1_a", [], count=0))
+        refetched = _comment(reddit, "a", "t3_post")
+        refetched.submission = _submission(reddit, [])
+        deep = _comment(reddit, "deep", "t1_a")
+        refetched.replies._comments.append(deep)
+        api = MagicMock()
+        api.get.return_value = (None, MagicMock(children=[refetched]))
+
+        expand_comments(submission, api)
+
+        api.post.assert_not_called()
+        assert "_/a" in api.get.call_args.args[0]
+        assert _flatten(submission.comments) == [(1, "a"), (2, "deep")]
+
+    def test_no_stubs_makes_no_requests(self, fake_submission: Any) -> None:
+        api = MagicMock()
+        expand_comments(fake_submission, api)
+        api.post.assert_not_called()
+        api.get.assert_not_called()
+
+
+class TestExpandDepth:
+    """max_depth skips stubs below the limit and asks for fewer levels."""
+
+    def test_stubs_below_max_depth_are_skipped(
+        self, reddit: praw.Reddit
+    ) -> None:
+        a = _comment(reddit, "a", "t3_post")
+        submission = _submission(reddit, [a, _more(reddit, "t3_post", ["b"])])
+        a.replies._comments.extend(
+            [_more(reddit, "t1_a", ["d"]), _more(reddit, "t1_a", [], count=0)]
+        )
+        api = MagicMock()
+        api.post.return_value = [_comment(reddit, "b", "t3_post")]
+
+        assert expand_comments(submission, api, max_depth=1) is True
+
+        api.get.assert_not_called()
+        assert api.post.call_count == 1
+        data = api.post.call_args.kwargs["data"]
+        assert data["children"] == "b"
+        assert data["depth"] == "1"
+        assert _flatten(submission.comments) == [(1, "a"), (1, "b")]
+
+    def test_continuation_requests_remaining_levels(
+        self, reddit: praw.Reddit
+    ) -> None:
+        a = _comment(reddit, "a", "t3_post")
+        submission = _submission(reddit, [a])
+        a.replies._comments.append(_more(reddit, "t1_a", [], count=0))
+        refetched = _comment(reddit, "a", "t3_post")
+        refetched.submission = _submission(reddit, [])
+        api = MagicMock()
+        api.get.return_value = (None, MagicMock(children=[refetched]))
+
+        expand_comments(submission, api, max_depth=3)
+
+        # Stub comments sit at depth 2, so levels 2-3 plus the parent
+        assert api.get.call_args.kwargs["params"]["depth"] == 3
+
+
+class TestExpandBudgets:
+    """max_requests / max_comments / timeout_s stop expansion early."""
+
+    @staticmethod
+    def _chain(reddit: praw.Reddit) -> tuple[Any, MagicMock]:
+        """Submission whose every morechildren call reveals one more stub."""
+        submission = _submission(reddit, [_more(reddit, "t3_post", ["c0"])])
+        api = MagicMock()
+
+        def post(path: str, data: dict[str, str]) -> list[Any]:
+            n = int(data["children"][1:])
+            return [
+                _comment(reddit, f"c{n}", "t3_post"),
+                _more(reddit, "t3_post", [f"c{n + 1}"]),
+            ]
+
+        api.post.side_effect = post
+        return submission, api
+
+    def test_unbounded_by_default_reports_complete(
+        self, reddit: praw.Reddit
+    ) -> None:
+        submission = _submission(reddit, [_more(reddit, "t3_post", ["a"])])
+        api = MagicMock()
+        api.post.return_value = [_comment(reddit, "a", "t3_post")]
+        assert expand_comments(submission, api) is True
+
+    def test_max_requests(self, reddit: praw.Reddit) -> None:
+        submission, api = self._chain(reddit)
+        assert expand_comments(submission, api, max_requests=3) is False
+        assert api.post.call_count == 3
+        assert [c.id for c in submission.comments] == ["c0", "c1", "c2"]
+
+    def test_max_comments(self, reddit: praw.Reddit) -> None:
+        submission, api = self._chain(reddit)
+        assert expand_comments(submission, api, max_comments=2) is False
+        assert [c.id for c in submission.comments] == ["c0", "c1"]
+
+    def test_timeout(self, reddit: praw.Reddit) -> None:
+        submission, api = self._chain(reddit)
+        assert expand_comments(submission, api, timeout_s=0) is False
+        api.post.assert_not_called()
+        assert list(submission.comments) == []
+
+
+class TestExpandKnownIds:
+    """Comments from an earlier capture are not requested again."""
+
+    def test_only_unknown_ids_requested(self, reddit: praw.Reddit) -> None:
+        a = _comment(reddit, "a", "t3_post")
+        submission = _submission(
+            reddit, [a, _more(reddit, "t3_post", ["b", "c", "n"])]
+        )
+        a.replies._comments.append(_more(reddit, "t1_a", ["d"]))
+        api = MagicMock()
+        api.post.return_value = [_comment(reddit, "n", "t3_post")]
+
+        expand_comments(submission, api, known_ids={"b", "c", "d"})
+
+        assert api.post.call_count == 1
+        assert api.post.call_args.kwargs["data"]["children"] == "n"
+        assert _flatten(submission.comments) == [(1, "a"), (1, "n")]
+
+    def test_all_known_makes_no_request(self, reddit: praw.Reddit) -> None:
+        submission = _submission(
+            reddit, [_more(reddit, "t3_post", ["b", "c"])]
+        )
+        api = MagicMock()
+
+        assert expand_comments(submission, api, known_ids={"b", "c"})
+        assert api.post.call_count == 0
+        assert _flatten(submission.comments) == []
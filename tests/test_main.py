@@ -1,8 +1,12 @@
 """Tests for Reddit2Text init, multi-URL, save_output, and shared behavior."""
 
+import io
+import json
 import os
+import sys
 from pathlib import Path
-from typing import Any
+from types import SimpleNamespace
+from typing import Any, List, Optional
 from unittest.mock import patch
 
 import pytest
@@ -122,3 +126,352 @@ class TestSaveOutputTo:
             mock_reddit.submission.return_value = fake_submission
             out = r2t.textualize_post("https://reddit.com/r/fake/comments/abc123/")
         assert isinstance(out, str)
+
+
+class TestConcurrentBatch:
+    """max_workers thread pool and textualize_batch."""
+
+    def test_max_workers_keeps_input_order(
+        self, fake_submission: Any, minimal_fake_submission: Any
+    ) -> None:
+        r = Reddit2Text(
+            client_id="id",
+            client_secret="secret",
+            user_agent="ua",
+            max_workers=4,
+        )
+        by_url = {"a": fake_submission, "b": minimal_fake_submission}
+        urls = ["a", "b", "a", "b", "b"]
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.side_effect = lambda url: by_url[url]
+            out = r.textualize_post(urls)
+        assert len(out) == 5
+        for url, text in zip(urls, out):
+            expected = "Sample post title" if url == "a" else "Title only"
+            assert expected in text
+
+    def test_batch_reports_failures_without_stopping(
+        self, fake_submission: Any
+    ) -> None:
+        r = Reddit2Text(
+            client_id="id",
+            client_secret="secret",
+            user_agent="ua",
+            max_workers=2,
+        )
+
+        def submission(url: str) -> Any:
+            if url == "bad":
+                raise RuntimeError("boom")
+            return fake_submission
+
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.side_effect = submission
+            results = r.textualize_batch(["good", "bad", "good"])
+        assert [res["url"] for res in results] == ["good", "bad", "good"]
+        assert results[0]["error"] is None
+        assert "Sample post title" in (results[0]["output"] or "")
+        assert isinstance(results[1]["error"], RuntimeError)
+        assert results[1]["output"] is None
+        assert results[2]["error"] is None
+
+    def test_batch_save_paths_per_url(
+        self,
+        fake_submission: Any,
+        minimal_fake_submission: Any,
+        tmp_path: Path,
+    ) -> None:
+        r = Reddit2Text(
+            client_id="id",
+            client_secret="secret",
+            user_agent="ua",
+            max_workers=2,
+        )
+        by_url = {"a": fake_submission, "b": minimal_fake_submission}
+        paths: List[Optional[str]] = [str(tmp_path / "a.txt"), None]
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.side_effect = lambda url: by_url[url]
+            r.textualize_batch(["a", "b"], save_paths=paths)
+            with pytest.raises(ValueError, match="one path per URL"):
+                r.textualize_batch(["a", "b"], save_paths=paths[:1])
+        assert "Sample post title" in (tmp_path / "a.txt").read_text()
+        assert [p.name for p in tmp_path.iterdir()] == ["a.txt"]
+
+    def test_textualize_post_raises_first_failure(
+        self, r2t: Reddit2Text
+    ) -> None:
+        with patch.object(r2t, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.side_effect = RuntimeError("boom")
+            with pytest.raises(RuntimeError, match="boom"):
+                r2t.textualize_post(["a", "b"])
+
+
+class TestDepthAwareFetch:
+    """max_comment_depth is passed to Reddit as the fetch depth."""
+
+    def test_depth_param_set_when_limited(
+        self, r2t: Reddit2Text, fake_submission: Any
+    ) -> None:
+        r2t.max_comment_depth = 2
+        with patch.object(r2t, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            r2t.textualize_post("https://reddit.com/r/fake/comments/abc123/")
+        assert fake_submission.fetch_params == {"depth": "2"}
+
+    @pytest.mark.parametrize("depth", [None, -1, 0])
+    def test_no_depth_param_when_unlimited_or_zero(
+        self, r2t: Reddit2Text, fake_submission: Any, depth: Any
+    ) -> None:
+        r2t.max_comment_depth = depth
+        with patch.object(r2t, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            r2t.textualize_post("https://reddit.com/r/fake/comments/abc123/")
+        assert fake_submission.fetch_params == {}
+
+
+class TestIncompleteFlag:
+    """Budget-limited expansion is flagged in the output."""
+
+    @pytest.mark.parametrize(
+        ("fmt", "marker"),
+        [("json", '"incomplete": true'), ("txt", "[Incomplete")],
+    )
+    def test_flag_in_output(
+        self, fake_submission: Any, fmt: Any, marker: str
+    ) -> None:
+        r = Reddit2Text(
+            client_id="id",
+            client_secret="secret",
+            user_agent="ua",
+            format=fmt,
+            max_expand_requests=1,
+        )
+        with (
+            patch.object(r, "_praw_reddit") as mock_reddit,
+            patch("reddit2text.main.expand_comments", return_value=False),
+        ):
+            mock_reddit.submission.return_value = fake_submission
+            out = r.textualize_post(
+                "https://reddit.com/r/fake/comments/abc123/"
+            )
+        assert marker in out
+
+    def test_complete_thread_has_no_flag(
+        self, r2t: Reddit2Text, fake_submission: Any
+    ) -> None:
+        r2t.format = "json"
+        with patch.object(r2t, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            out = r2t.textualize_post(
+                "https://reddit.com/r/fake/comments/abc123/"
+            )
+        assert "incomplete" not in out
+
+
+class TestCommentTable:
+    """Single-pass traversal into a flat pre-order table."""
+
+    def test_preorder_rows_with_parent_indices(
+        self, r2t: Reddit2Text, fake_submission: Any
+    ) -> None:
+        table = r2t._build_comment_table(fake_submission.comments)
+        assert table.ids == ["c0", "c0_0", "c1"]
+        assert list(table.parents) == [-1, 0, -1]
+        assert list(table.depths) == [1, 2, 1]
+        assert table.authors == ["commenter_one", "commenter_two", "[deleted]"]
+
+    def test_depth_limit_applied_during_walk(
+        self, r2t: Reddit2Text, fake_submission: Any
+    ) -> None:
+        r2t.max_comment_depth = 1
+        table = r2t._build_comment_table(fake_submission.comments)
+        assert table.ids == ["c0", "c1"]
+
+    def test_columns_are_compact(
+        self, r2t: Reddit2Text, fake_submission: Any
+    ) -> None:
+        table = r2t._build_comment_table(fake_submission.comments)
+        assert table.scores.typecode == "i"
+        assert table.authors[0] is sys.intern("commenter_one")
+
+
+class TestJsonEncoder:
+    """Streaming JSON encoding straight from the comment table."""
+
+    @pytest.mark.parametrize("depth", [None, 0, 1, 2])
+    @pytest.mark.parametrize("indent", [2, 4, None])
+    def test_matches_json_dumps(
+        self, fake_submission: Any, depth: Any, indent: Any
+    ) -> None:
+        r = Reddit2Text(
+            client_id="id",
+            client_secret="secret",
+            user_agent="ua",
+            format="json",
+            max_comment_depth=depth,
+            json_indent=indent,
+        )
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            out = r.textualize_post("u")
+        data = json.loads(out)
+        separators = (",", ":") if indent is None else None
+        assert out == json.dumps(data, indent=indent, separators=separators)
+
+    def test_compact_has_no_whitespace_between_tokens(
+        self, fake_submission: Any
+    ) -> None:
+        r = Reddit2Text(
+            client_id="id",
+            client_secret="secret",
+            user_agent="ua",
+            format="json",
+            json_indent=None,
+        )
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            out = r.textualize_post("u")
+        assert "\n" not in out
+        assert out.startswith('{"post":{"title":')
+
+
+class TestMultiFormat:
+    """textualize_post(..., formats=[...]) renders one fetch many ways."""
+
+    FORMATS = ["txt", "json", "csv_relational"]
+
+    def test_one_fetch_matches_single_format_output(
+        self, r2t: Reddit2Text, fake_submission: Any
+    ) -> None:
+        with patch.object(r2t, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            out = r2t.textualize_post("u", formats=self.FORMATS)
+            assert mock_reddit.submission.call_count == 1
+            expected = {}
+            for fmt in self.FORMATS:
+                r2t.format = fmt
+                expected[fmt] = r2t.textualize_post("u")
+        assert out == expected
+
+    def test_each_format_saved_to_its_own_path(
+        self, r2t: Reddit2Text, fake_submission: Any, tmp_path: Path
+    ) -> None:
+        r2t.save_output_to = str(tmp_path / "thread.out")
+        with patch.object(r2t, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            outs = r2t.textualize_post(["u", "v"], formats=self.FORMATS)
+        assert isinstance(outs, list) and len(outs) == 2
+        assert (tmp_path / "thread.txt").read_text() == outs[1]["txt"]
+        assert (tmp_path / "thread.json").read_text() == outs[1]["json"]
+        assert (tmp_path / "thread_posts.csv").exists()
+        assert (tmp_path / "thread_comments.csv").exists()
+
+    def test_invalid_formats_rejected(self, r2t: Reddit2Text) -> None:
+        with pytest.raises(ValueError):
+            r2t.textualize_post("u", formats=["txt", "yaml"])
+        with pytest.raises(ValueError):
+            r2t.textualize_batch(["u"], formats=[])
+
+    @pytest.mark.parametrize("fmt", ["sqlite", "parquet"])
+    def test_file_only_formats_need_a_path(
+        self, r2t: Reddit2Text, fake_submission: Any, fmt: str
+    ) -> None:
+        with patch.object(r2t, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            with pytest.raises(ValueError, match="save_output_to"):
+                r2t.textualize_post("u", formats=["txt", fmt])
+            r2t.format = fmt
+            with pytest.raises(ValueError, match="save_output_to"):
+                r2t.textualize_post("u")
+
+
+class TestSubreddit:
+    """textualize_subreddit streams a listing through the pool."""
+
+    def _listing(self, n: int, pulled: list[int]) -> Any:
+        for i in range(n):
+            pulled.append(i)
+            yield SimpleNamespace(permalink=f"/r/sub/comments/p{i}/t/")
+
+    def test_yields_results_in_listing_order(
+        self, fake_submission: Any
+    ) -> None:
+        r = Reddit2Text(
+            client_id="id",
+            client_secret="secret",
+            user_agent="ua",
+            max_workers=2,
+        )
+        pulled: list[int] = []
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            mock_reddit.subreddit.return_value.top.return_value = (
+                self._listing(10, pulled)
+            )
+            results = r.textualize_subreddit(
+                "sub", sort="top", limit=10, time_filter="week"
+            )
+            first = next(results)
+            # Only a window of 2 * max_workers posts was pulled so far
+            assert len(pulled) == 4
+            rest = list(results)
+        mock_reddit.subreddit.return_value.top.assert_called_once_with(
+            time_filter="week", limit=10
+        )
+        urls = [first["url"]] + [res["url"] for res in rest]
+        assert urls == [
+            f"https://www.reddit.com/r/sub/comments/p{i}/t/" for i in range(10)
+        ]
+        assert all(res["error"] is None for res in [first] + rest)
+
+    def test_invalid_sort(self, r2t: Reddit2Text) -> None:
+        with patch.object(r2t, "_praw_reddit"):
+            with pytest.raises(ValueError):
+                sort: Any = "best"
+                next(r2t.textualize_subreddit("sub", sort=sort))
+
+
+class TestStreaming:
+    """iter_textualize / textualize_to."""
+
+    @pytest.mark.parametrize("fmt", ["txt", "json", "csv"])
+    def test_chunks_join_to_textualize_post_output(
+        self, fake_submission: Any, fmt: Any
+    ) -> None:
+        r = Reddit2Text(
+            client_id="id", client_secret="secret", user_agent="ua", format=fmt
+        )
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            expected = r.textualize_post("u")
+            chunks = list(r.iter_textualize("u"))
+        assert "".join(chunks) == expected
+
+    def test_large_output_is_split_into_chunks(
+        self, r2t: Reddit2Text, fake_submission: Any
+    ) -> None:
+        big = "x" * 100_000
+        for c in fake_submission._comments:
+            c.body = big
+        with patch.object(r2t, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            chunks = list(r2t.iter_textualize("u"))
+        assert len(chunks) > 1
+
+    def test_textualize_to_text_and_binary(
+        self, r2t: Reddit2Text, fake_submission: Any
+    ) -> None:
+        text_fp = io.StringIO()
+        bin_fp = io.BytesIO()
+        with patch.object(r2t, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            n = r2t.textualize_to("u", text_fp)
+            r2t.textualize_to("u", bin_fp)
+        assert n == len(text_fp.getvalue())
+        assert "Sample post title" in text_fp.getvalue()
+        assert bin_fp.getvalue().decode() == text_fp.getvalue()
+
+    def test_csv_relational_not_streamable(self, r2t: Reddit2Text) -> None:
+        r2t.format = "csv_relational"
+        with pytest.raises(ValueError, match="csv_relational"):
+            r2t.iter_textualize("u")
@@ -0,0 +1,111 @@
+"""Tests for the checkpoint manifest and resumable batches."""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from reddit2text.main import Reddit2Text
+from reddit2text.manifest import Manifest
+
+GOOD = "https://reddit.com/r/fake/comments/post/title/"
+BAD = "https://reddit.com/r/fake/comments/bad/title/"
+
+
+class TestManifest:
+    """Records, latest-wins reload and crash tolerance."""
+
+    def test_records_survive_reopen(self, tmp_path: Path) -> None:
+        path = str(tmp_path / "run.jsonl")
+        with Manifest(path) as m:
+            m.record("a", [], error=ValueError("boom"))
+            m.record("b", ["b.txt"], "text")
+            m.record("a", ["a.txt"], "retried")
+        with open(path, "a") as f:
+            f.write('{"url": "c", "sta')  # cut short by a crash
+        with Manifest(path) as m:
+            assert m.is_done("a") and m.is_done("b")
+            assert not m.is_done("c")
+            m.record("c", ["c.txt"], "after the crash")
+        with Manifest(path) as m:
+            assert m.is_done("c")
+            assert m.records["b"]["paths"] == ["b.txt"]
+            assert (
+                m.records["b"]["sha256"] == hashlib.sha256(b"text").hexdigest()
+            )
+
+
+class TestResumableBatch:
+    """textualize_batch(manifest=...) skips done URLs, retries failures."""
+
+    def test_resume(self, fake_submission: Any, tmp_path: Path) -> None:
+        manifest = str(tmp_path / "run.jsonl")
+        r = Reddit2Text(
+            client_id="id",
+            client_secret="secret",
+            user_agent="ua",
+            save_output_to=str(tmp_path / "out.txt"),
+        )
+
+        def submission(url: str) -> Any:
+            if "bad" in url:
+                raise ValueError("boom")
+            return fake_submission
+
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.side_effect = submission
+            first = r.textualize_batch([GOOD, BAD], manifest=manifest)
+            assert first[0]["error"] is None
+            assert isinstance(first[1]["error"], ValueError)
+
+            lines = Path(manifest).read_text().splitlines()
+            records = [json.loads(line) for line in lines]
+            assert [(x["url"], x["status"]) for x in records] == [
+                (GOOD, "done"),
+                (BAD, "failed"),
+            ]
+            assert records[0]["paths"] == [str(tmp_path / "out.txt")]
+            assert records[1]["error"] == "ValueError: boom"
+
+            mock_reddit.submission.reset_mock()
+            second = r.textualize_batch([GOOD, BAD], manifest=manifest)
+
+        # Only the failure was tried again
+        assert mock_reddit.submission.call_count == 1
+        assert second[0] == {
+            "url": GOOD,
+            "output": None,
+            "error": None,
+            "skipped": True,
+        }
+        assert isinstance(second[1]["error"], ValueError)
+
+    def test_resume_appends_to_jsonl(
+        self, fake_submission: Any, tmp_path: Path
+    ) -> None:
+        manifest = str(tmp_path / "run.jsonl")
+        out = tmp_path / "out.jsonl"
+        r = Reddit2Text(
+            client_id="id",
+            client_secret="secret",
+            user_agent="ua",
+            format="jsonl",
+            save_output_to=str(out),
+        )
+        failing = [True]
+
+        def submission(url: str) -> Any:
+            if "bad" in url and failing[0]:
+                raise ValueError("boom")
+            return fake_submission
+
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.side_effect = submission
+            r.textualize_batch([GOOD, BAD], manifest=manifest)
+            assert len(out.read_text().splitlines()) == 1
+            failing[0] = False
+            r.textualize_batch([GOOD, BAD], manifest=manifest)
+
+        # The retried thread was added after the one already done
+        assert len(out.read_text().splitlines()) == 2
@@ -0,0 +1,94 @@
+"""Tests for JSON Lines output format."""
+
+import json
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from reddit2text.main import Reddit2Text
+
+URL = "https://reddit.com/r/fake/comments/abc123/"
+
+
+@pytest.fixture
+def r2t_jsonl():
+    """Reddit2Text with jsonl format."""
+    return Reddit2Text(
+        client_id="test_id",
+        client_secret="test_secret",
+        user_agent="test_agent",
+        format="jsonl",
+    )
+
+
+def _lines(out: str) -> list[Any]:
+    assert out.endswith("\n")
+    return [json.loads(line) for line in out.splitlines()]
+
+
+class TestThreadRecords:
+    """Default: one line per thread."""
+
+    def test_one_line_matching_json_output(
+        self, r2t_jsonl: Reddit2Text, fake_submission: Any
+    ) -> None:
+        with patch.object(r2t_jsonl, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            out = r2t_jsonl.textualize_post(URL)
+            r2t_jsonl.format = "json"
+            expected = json.loads(r2t_jsonl.textualize_post(URL))
+        (record,) = _lines(out)
+        assert record.pop("post_id") == "post"
+        assert record == expected
+
+
+class TestCommentRecords:
+    """jsonl_records='comment': a post line, then one line per comment."""
+
+    def test_post_then_flat_comments(
+        self, r2t_jsonl: Reddit2Text, fake_submission: Any
+    ) -> None:
+        r2t_jsonl.jsonl_records = "comment"
+        with patch.object(r2t_jsonl, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            out = r2t_jsonl.textualize_post(URL)
+        post, *comments = _lines(out)
+        assert post["record"] == "post"
+        assert post["post_id"] == "post"
+        assert post["title"] == "Sample post title"
+        assert comments
+        assert all(c["record"] == "comment" for c in comments)
+        top = [c for c in comments if c["depth"] == 1]
+        assert all(c["parent_id"] == "post" for c in top)
+        ids = {c["comment_id"] for c in comments}
+        assert all(c["parent_id"] in ids for c in comments if c["depth"] > 1)
+
+
+class TestAppend:
+    """Lines accumulate in save_output_to across one call."""
+
+    def test_multi_url_call_appends(
+        self, r2t_jsonl: Reddit2Text, fake_submission: Any, tmp_path: Path
+    ) -> None:
+        out_path = tmp_path / "out.jsonl"
+        out_path.write_text("stale\n")
+        r2t_jsonl.save_output_to = str(out_path)
+        with patch.object(r2t_jsonl, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            outs = r2t_jsonl.textualize_post([URL, URL, URL])
+        # The first thread replaces old contents, the rest are appended
+        assert out_path.read_text() == "".join(outs)
+        assert len(out_path.read_text().splitlines()) == 3
+
+    def test_other_formats_still_overwrite(
+        self, r2t_jsonl: Reddit2Text, fake_submission: Any, tmp_path: Path
+    ) -> None:
+        out_path = tmp_path / "out.json"
+        r2t_jsonl.format = "json"
+        r2t_jsonl.save_output_to = str(out_path)
+        with patch.object(r2t_jsonl, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            outs = r2t_jsonl.textualize_post([URL, URL])
+        assert out_path.read_text() == outs[1]
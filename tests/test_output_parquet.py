@@ -0,0 +1,73 @@
+"""Tests for Parquet output format (needs the parquet extra)."""
+
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from reddit2text.main import Reddit2Text
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+URL = "https://reddit.com/r/fake/comments/abc123/"
+
+
+@pytest.fixture
+def r2t_parquet(tmp_path: Path):
+    """Reddit2Text with parquet format saving under tmp_path."""
+    return Reddit2Text(
+        client_id="test_id",
+        client_secret="test_secret",
+        user_agent="test_agent",
+        format="parquet",
+        save_output_to=str(tmp_path / "thread.parquet"),
+    )
+
+
+class TestParquetFiles:
+    """Same tables as csv_relational, written as Parquet."""
+
+    def test_writes_posts_and_comments(
+        self, r2t_parquet: Reddit2Text, fake_submission: Any, tmp_path: Path
+    ) -> None:
+        with patch.object(r2t_parquet, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            out = r2t_parquet.textualize_post(URL)
+        assert out.startswith("post_id,title")
+        posts = pq.read_table(tmp_path / "thread_posts.parquet")
+        assert posts.column("title").to_pylist() == ["Sample post title"]
+        comments = pq.read_table(tmp_path / "thread_comments.parquet")
+        assert comments.column_names == [
+            "comment_id",
+            "post_id",
+            "parent_id",
+            "depth",
+            "author",
+            "score",
+            "body",
+        ]
+        assert pa.types.is_dictionary(comments.schema.field("author").type)
+        assert pa.types.is_int32(comments.schema.field("depth").type)
+
+    def test_rows_match_csv_relational(
+        self, r2t_parquet: Reddit2Text, fake_submission: Any, tmp_path: Path
+    ) -> None:
+        import csv
+        import io
+
+        with patch.object(r2t_parquet, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            r2t_parquet.textualize_post(URL)
+            r2t_parquet.format = "csv_relational"
+            r2t_parquet.textualize_post(URL)
+        comments = pq.read_table(tmp_path / "thread_comments.parquet")
+        rows = list(
+            csv.reader(
+                io.StringIO((tmp_path / "thread_comments.csv").read_text())
+            )
+        )[1:]
+        assert [
+            [str(v) for v in row.values()] for row in comments.to_pylist()
+        ] == rows
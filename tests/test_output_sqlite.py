@@ -0,0 +1,98 @@
+"""Tests for the SQLite output format."""
+
+import sqlite3
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from reddit2text.main import Reddit2Text
+
+URL = "https://reddit.com/r/fake/comments/abc123/"
+
+
+@pytest.fixture
+def db_path(tmp_path: Path) -> Path:
+    return tmp_path / "threads.db"
+
+
+@pytest.fixture
+def r2t_sqlite(db_path: Path):
+    """Reddit2Text with sqlite format saving to db_path."""
+    return Reddit2Text(
+        client_id="test_id",
+        client_secret="test_secret",
+        user_agent="test_agent",
+        format="sqlite",
+        save_output_to=str(db_path),
+    )
+
+
+def _query(db_path: Path, sql: str) -> list[Any]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+class TestSqliteSink:
+    """Relational schema, upserts and indexes."""
+
+    def test_rows_match_csv_relational(
+        self, r2t_sqlite: Reddit2Text, fake_submission: Any, db_path: Path
+    ) -> None:
+        import csv
+        import io
+
+        with patch.object(r2t_sqlite, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            out = r2t_sqlite.textualize_post(URL)
+            r2t_sqlite.format = "csv_relational"
+            r2t_sqlite.save_output_to = str(db_path.parent / "thread.csv")
+            r2t_sqlite.textualize_post(URL)
+        assert out.startswith("post_id,title")
+        posts = _query(db_path, "SELECT post_id, title FROM posts")
+        assert posts == [("post", "Sample post title")]
+        rows = _query(
+            db_path,
+            "SELECT comment_id, post_id, parent_id, depth, author, score,"
+            " body FROM comments ORDER BY rowid",
+        )
+        csv_rows = list(
+            csv.reader(
+                io.StringIO(
+                    (db_path.parent / "thread_comments.csv").read_text()
+                )
+            )
+        )[1:]
+        assert [[str(v) for v in row] for row in rows] == csv_rows
+
+    def test_rerun_updates_in_place(
+        self, r2t_sqlite: Reddit2Text, fake_submission: Any, db_path: Path
+    ) -> None:
+        with patch.object(r2t_sqlite, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            r2t_sqlite.textualize_post([URL, URL])
+            n = _query(db_path, "SELECT COUNT(*) FROM comments")[0][0]
+            fake_submission.score = 999
+            fake_submission._comments[0].body = "edited"
+            r2t_sqlite.textualize_post(URL)
+        assert _query(db_path, "SELECT COUNT(*) FROM comments")[0][0] == n
+        assert _query(db_path, "SELECT upvotes FROM posts") == [(999,)]
+        assert ("edited",) in _query(db_path, "SELECT body FROM comments")
+
+    def test_indexes_exist(
+        self, r2t_sqlite: Reddit2Text, fake_submission: Any, db_path: Path
+    ) -> None:
+        with patch.object(r2t_sqlite, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            r2t_sqlite.textualize_post(URL)
+        names = {
+            name
+            for (name,) in _query(
+                db_path, "SELECT name FROM sqlite_master WHERE type='index'"
+            )
+        }
+        assert {"comments_post_id", "comments_parent_id"} <= names
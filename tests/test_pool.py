@@ -0,0 +1,128 @@
+"""Tests for the credential pool."""
+
+import time
+from types import SimpleNamespace
+from typing import Any, List
+
+import pytest
+from prawcore.exceptions import NotFound, ResponseException, TooManyRequests
+
+from reddit2text.main import Reddit2Text
+from reddit2text.pool import ClientPool, PooledClient
+from reddit2text.ratelimit import RateLimitScheduler
+
+
+def _response(status: int, **headers: str) -> Any:
+    return SimpleNamespace(status_code=status, headers=headers, text="")
+
+
+class FakeSession:
+    def __init__(self, *outcomes: Any) -> None:
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def request(self, **kwargs: Any) -> Any:
+        self.calls += 1
+        outcome = self.outcomes.pop(0) if self.outcomes else "ok"
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _pool(*sessions: FakeSession) -> ClientPool:
+    return ClientPool(
+        [
+            PooledClient(f"app{i}", s, RateLimitScheduler())
+            for i, s in enumerate(sessions)
+        ]
+    )
+
+
+class TestClientPool:
+    """Spreading requests, failover and health."""
+
+    def test_spreads_requests_across_clients(self) -> None:
+        a, b = FakeSession(), FakeSession()
+        pool = _pool(a, b)
+        for _ in range(4):
+            assert pool.request(method="GET", path="x") == "ok"
+        assert (a.calls, b.calls) == (2, 2)
+
+    def test_prefers_client_with_more_quota(self) -> None:
+        a, b = FakeSession(), FakeSession()
+        pool = _pool(a, b)
+        headers = {"x-ratelimit-remaining": "5", "x-ratelimit-reset": "60"}
+        pool.clients[0].scheduler.acquire()
+        pool.clients[0].scheduler.release(headers)
+        headers = {"x-ratelimit-remaining": "90", "x-ratelimit-reset": "60"}
+        pool.clients[1].scheduler.acquire()
+        pool.clients[1].scheduler.release(headers)
+        pool.request(method="GET", path="x")
+        assert (a.calls, b.calls) == (0, 1)
+
+    def test_fails_over_on_rate_and_auth_errors(self) -> None:
+        limited = FakeSession(
+            TooManyRequests(_response(429, **{"retry-after": "30"}))
+        )
+        unauthorized = FakeSession(ResponseException(_response(401)))
+        good = FakeSession()
+        pool = _pool(limited, unauthorized, good)
+        assert pool.request(method="GET", path="x") == "ok"
+        assert pool.request(method="GET", path="x") == "ok"
+        assert good.calls == 2
+        bad = pool.clients[:2]
+        assert [c.healthy() for c in bad] == [False, False]
+        assert [c.failures for c in bad] == [1, 1]
+        assert pool.clients[2].healthy()
+
+    def test_content_errors_do_not_fail_over(self) -> None:
+        a = FakeSession(NotFound(_response(404)))
+        b = FakeSession()
+        pool = _pool(a, b)
+        with pytest.raises(NotFound):
+            pool.request(method="GET", path="x")
+        assert b.calls == 0
+        assert pool.clients[0].healthy()
+
+    def test_waits_for_cooldown_when_every_client_is_benched(self) -> None:
+        a, b = FakeSession(), FakeSession()
+        pool = _pool(a, b)
+        now = time.monotonic()
+        pool.clients[0].cooldown_until = now + 0.2
+        pool.clients[1].cooldown_until = now + 0.1
+        assert pool.request(method="GET", path="x") == "ok"
+        assert time.monotonic() - now >= 0.1
+        assert (a.calls, b.calls) == (0, 1)
+
+    def test_raises_when_every_client_fails(self) -> None:
+        errors: List[Exception] = [
+            TooManyRequests(_response(429)),
+            ResponseException(_response(401)),
+        ]
+        pool = _pool(*(FakeSession(e) for e in errors))
+        with pytest.raises(ResponseException):
+            pool.request(method="GET", path="x")
+
+
+class TestCredentialsOption:
+    """Reddit2Text(credentials=[...])."""
+
+    CREDS = [
+        {"client_id": "a", "client_secret": "s", "user_agent": "ua"},
+        {"client_id": "b", "client_secret": "s", "user_agent": "ua"},
+    ]
+
+    def test_installs_pool(self) -> None:
+        r = Reddit2Text(credentials=self.CREDS)  # type: ignore[arg-type]
+        assert r.client_pool is not None
+        assert r._praw_reddit._core is r.client_pool
+        assert [c.client_id for c in r.client_pool.clients] == ["a", "b"]
+        schedulers = {id(c.scheduler) for c in r.client_pool.clients}
+        assert len(schedulers) == 2
+
+    def test_rejects_shared_rate_limiter(self) -> None:
+        with pytest.raises(ValueError):
+            Reddit2Text(
+                credentials=self.CREDS,  # type: ignore[arg-type]
+                rate_limiter=RateLimitScheduler(),
+            )
@@ -0,0 +1,104 @@
+"""Tests for the shared rate-limit scheduler."""
+
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from reddit2text.main import Reddit2Text
+from reddit2text.ratelimit import RateLimitScheduler, in_context, priority
+
+
+def _headers(remaining: int, reset: float) -> dict[str, str]:
+    return {
+        "x-ratelimit-remaining": str(remaining),
+        "x-ratelimit-used": "0",
+        "x-ratelimit-reset": str(reset),
+    }
+
+
+def _call(scheduler: RateLimitScheduler, headers: Any) -> None:
+    scheduler.call(
+        method="GET",
+        request_function=lambda method, url, **kw: SimpleNamespace(
+            headers=headers, content=b"{}"
+        ),
+        set_header_callback=dict,
+        url="https://oauth.reddit.com/x",
+    )
+
+
+class TestRateLimitScheduler:
+    """Quota from headers, waiting for the reset, and priorities."""
+
+    def test_spends_quota_then_waits_for_reset(self) -> None:
+        scheduler = RateLimitScheduler()
+        _call(scheduler, _headers(2, 0.3))
+        start = time.monotonic()
+        _call(scheduler, {})
+        _call(scheduler, {})
+        assert time.monotonic() - start < 0.1
+        assert scheduler.remaining == 0
+        _call(scheduler, _headers(10, 60))
+        assert time.monotonic() - start >= 0.25
+        assert scheduler.waits == 1
+        assert scheduler.remaining == 10
+
+    def test_unknown_quota_allows_one_probe_at_a_time(self) -> None:
+        scheduler = RateLimitScheduler()
+        scheduler.acquire()
+        got = threading.Event()
+
+        def second() -> None:
+            scheduler.acquire()
+            got.set()
+
+        t = threading.Thread(target=second)
+        t.start()
+        assert not got.wait(0.1)
+        scheduler.release(_headers(5, 60))
+        assert got.wait(1)
+        t.join()
+
+    def test_higher_priority_waiter_goes_first(self) -> None:
+        scheduler = RateLimitScheduler()
+        scheduler.acquire()  # probe in flight; everyone else queues
+        order: list[str] = []
+
+        def job(name: str) -> None:
+            scheduler.acquire()
+            order.append(name)
+            scheduler.release()
+
+        low = threading.Thread(target=in_context(job), args=("low",))
+        with priority(5):
+            high = threading.Thread(target=in_context(job), args=("high",))
+        low.start()
+        time.sleep(0.05)
+        high.start()
+        time.sleep(0.05)
+        scheduler.release(_headers(10, 60))
+        low.join()
+        high.join()
+        assert order == ["high", "low"]
+
+
+class TestInstall:
+    """Reddit2Text routes its praw sessions through the scheduler."""
+
+    def test_sessions_share_instance_scheduler(self) -> None:
+        shared = RateLimitScheduler()
+        a = Reddit2Text(
+            client_id="id",
+            client_secret="secret",
+            user_agent="ua",
+            rate_limiter=shared,
+        )
+        b = Reddit2Text(
+            client_id="id",
+            client_secret="secret",
+            user_agent="ua",
+            rate_limiter=shared,
+        )
+        for r in (a, b):
+            assert r._praw_reddit._read_only_core._rate_limiter is shared
@@ -0,0 +1,213 @@
+"""Tests for the raw-JSON engine (reddit2text.raw / engine="json")."""
+
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from reddit2text import raw
+from reddit2text.main import Reddit2Text
+from reddit2text.models import CommentDict, ThreadJson
+
+URL = "https://reddit.com/r/fake/comments/abc123/"
+
+
+def _listing(children: list[dict[str, Any]]) -> dict[str, Any]:
+    return {"kind": "Listing", "data": {"children": children}}
+
+
+def _comment_things(
+    comments: list[CommentDict], parent: str, prefix: str = "c"
+) -> list[dict[str, Any]]:
+    """Reddit JSON for fixture comments, with the ids conftest fakes use."""
+    things = []
+    for i, c in enumerate(comments):
+        cid = f"{prefix}{i}"
+        replies = _comment_things(c["replies"], f"t1_{cid}", f"{cid}_")
+        things.append(
+            {
+                "kind": "t1",
+                "data": {
+                    "id": cid,
+                    "parent_id": parent,
+                    "author": c["author"],
+                    "score": c["score"],
+                    "body": c["body"],
+                    "replies": _listing(replies) if replies else "",
+                },
+            }
+        )
+    return things
+
+
+def thread_json(data: ThreadJson) -> list[dict[str, Any]]:
+    """The /comments/<id> response for a fixture thread."""
+    post = data["post"]
+    submission = {
+        "kind": "t3",
+        "data": {
+            "id": "post",
+            "title": post["title"],
+            "author": post["author"],
+            "score": post["upvotes"],
+            "selftext": post["selftext"],
+            "num_comments": post["num_comments"],
+        },
+    }
+    return [
+        _listing([submission]),
+        _listing(_comment_things(data["comments"], "t3_post")),
+    ]
+
+
+def _r2t(**kwargs: Any) -> Reddit2Text:
+    return Reddit2Text(
+        client_id="test_id",
+        client_secret="test_secret",
+        user_agent="test_agent",
+        **kwargs,
+    )
+
+
+class TestParse:
+    """Listing JSON -> records."""
+
+    def test_parse_nested_listing(
+        self, sample_thread_data: ThreadJson
+    ) -> None:
+        forest = raw.parse_listing(thread_json(sample_thread_data)[1])
+        assert [c.id for c in forest] == ["c0", "c1"]
+        first = forest[0]
+        assert isinstance(first, raw.RawComment)
+        assert first.author == "commenter_one"
+        assert [r.body for r in first.replies] == [
+            "A reply to the first comment."
+        ]
+        # Deleted authors become None, as with PRAW
+        assert forest[1].author is None
+
+    def test_more_stub(self) -> None:
+        stub = raw.parse_thing(
+            {
+                "kind": "more",
+                "data": {"parent_id": "t3_x", "children": ["a"], "count": 1},
+            }
+        )
+        assert isinstance(stub, raw.RawMore)
+        assert stub.children == ["a"]
+
+    def test_records_use_slots(self) -> None:
+        c = raw.RawComment("a", "t3_x", "u", 1, "b")
+        assert not hasattr(c, "__dict__")
+
+
+class TestJsonEngine:
+    """engine="json" renders the same output as the PRAW engine."""
+
+    @pytest.mark.parametrize("fmt", ["txt", "json", "csv", "csv_relational"])
+    def test_matches_praw_engine(
+        self,
+        fmt: Any,
+        sample_thread_data: ThreadJson,
+        fake_submission: Any,
+    ) -> None:
+        praw_r2t = _r2t(format=fmt)
+        with patch.object(praw_r2t, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            expected = praw_r2t.textualize_post(URL)
+
+        json_r2t = _r2t(format=fmt, engine="json")
+        with patch.object(json_r2t, "_praw_reddit") as mock_reddit:
+            mock_reddit.request.return_value = thread_json(sample_thread_data)
+            out = json_r2t.textualize_post(URL)
+            mock_reddit.submission.assert_not_called()
+        assert out == expected
+
+    def test_depth_param_and_more_expansion(
+        self, minimal_thread_data: ThreadJson
+    ) -> None:
+        listing = thread_json(minimal_thread_data)
+        listing[1]["data"]["children"] = [
+            {
+                "kind": "more",
+                "data": {
+                    "parent_id": "t3_post",
+                    "children": ["z"],
+                    "count": 1,
+                },
+            }
+        ]
+        morechildren = {
+            "json": {
+                "data": {
+                    "things": [
+                        {
+                            "kind": "t1",
+                            "data": {
+                                "id": "z",
+                                "parent_id": "t3_post",
+                                "author": "late",
+                                "score": 3,
+                                "body": "Loaded later.",
+                                "replies": "",
+                            },
+                        }
+                    ]
+                }
+            }
+        }
+        api = MagicMock()
+        api.request.side_effect = [listing, morechildren]
+        r = _r2t(engine="json", max_comment_depth=1)
+        with patch.object(r, "_praw_reddit", api):
+            out = r.textualize_post(URL)
+        assert "late (3 upvotes): Loaded later." in out
+        first, second = api.request.call_args_list
+        assert first.kwargs["params"]["depth"] == 1
+        assert second.kwargs["data"]["children"] == "z"
+
+
+class TestHeaderOnlyBatch:
+    """max_comment_depth=0 batches resolve posts via /api/info."""
+
+    def test_info_requests_in_groups_of_100(
+        self, sample_thread_data: ThreadJson
+    ) -> None:
+        r = _r2t(engine="json", max_comment_depth=0)
+        post = thread_json(sample_thread_data)[0]["data"]["children"][0]
+        urls = [
+            f"https://reddit.com/r/fake/comments/p{i}/" for i in range(250)
+        ]
+
+        def request(method: str, path: str, params: dict[str, Any]) -> Any:
+            assert path == "api/info/"
+            return _listing(
+                [
+                    {"kind": "t3", "data": {**post["data"], "id": name[3:]}}
+                    for name in params["id"].split(",")
+                ]
+            )
+
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.request.side_effect = request
+            results = r.textualize_batch(urls)
+        assert mock_reddit.request.call_count == 3
+        assert all(res["error"] is None for res in results)
+        assert "Sample post title" in str(results[-1]["output"])
+
+    def test_praw_engine_uses_info_and_skips_comments(
+        self, fake_submission: Any
+    ) -> None:
+        r = _r2t(max_comment_depth=0)
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.info.return_value = [fake_submission]
+            mock_reddit.submission.return_value = fake_submission
+            out = r.textualize_post(
+                [URL.replace("abc123", "post"), URL.replace("abc123", "gone")]
+            )
+        mock_reddit.info.assert_called_once_with(
+            fullnames=["t3_post", "t3_gone"]
+        )
+        # Only the post missing from the info response is fetched alone
+        assert mock_reddit.submission.call_count == 1
+        assert "Sample post title" in out[0]
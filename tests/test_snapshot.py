@@ -0,0 +1,237 @@
+"""Tests for incremental refresh from an earlier snapshot."""
+
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from reddit2text.main import Reddit2Text
+from reddit2text.models import CommentTable
+from reddit2text.snapshot import load_snapshot, merge
+
+URL = "https://reddit.com/r/fake/comments/post/title/"
+
+
+def _table(rows: list[tuple[str, int, int, str]]) -> CommentTable:
+    table = CommentTable()
+    for comment_id, parent, depth, body in rows:
+        table.append(comment_id, parent, depth, "a", 1, body)
+    return table
+
+
+class TestMerge:
+    """Fresh rows win; snapshot-only rows keep their place."""
+
+    def test_merge_interleaves_like_a_full_capture(self) -> None:
+        full = _table(
+            [
+                ("a", -1, 1, "a"),
+                ("d", -1, 1, "d"),
+                ("d1", 1, 2, "d1"),
+                ("d2", 1, 2, "d2"),
+                ("f", -1, 1, "f"),
+            ]
+        )
+        old = _table(
+            [("a", -1, 1, "a"), ("d", -1, 1, "d"), ("d1", 1, 2, "d1")]
+        )
+        # d and d1 were skipped as known; d2 and f are new
+        new = _table(
+            [("a", -1, 1, "a"), ("d2", -1, 1, "d2"), ("f", -1, 1, "f")]
+        )
+        new.orphan_parents[1] = "d"
+        merged, _, _ = merge(old, new)
+        assert merged.ids == full.ids
+        assert merged.parents.tolist() == full.parents.tolist()
+        assert merged.depths.tolist() == full.depths.tolist()
+
+    def test_merge_keeps_hidden_snapshot_comments(self) -> None:
+        old = _table(
+            [("a", -1, 1, "a"), ("a1", 0, 2, "a1"), ("b", -1, 1, "b")]
+        )
+        # a1 was behind a stub that was not re-requested; b was edited
+        new = _table(
+            [("a", -1, 1, "a"), ("a2", 0, 2, "a2"), ("b", -1, 1, "b!")]
+        )
+        merged, new_ids, edited = merge(old, new)
+        assert list(zip(merged.ids, merged.depths)) == [
+            ("a", 1),
+            ("a1", 2),
+            ("a2", 2),
+            ("b", 1),
+        ]
+        assert merged.parents.tolist() == [-1, 0, 0, -1]
+        assert merged.bodies[3] == "b!"
+        assert new_ids == ["a2"]
+        assert edited == ["b"]
+
+    def test_merge_attaches_reply_to_snapshot_only_parent(self) -> None:
+        old = _table([("a", -1, 1, "a"), ("b", 0, 2, "b"), ("b1", 1, 3, "b1")])
+        # b and b1 were skipped as known; b2 came back without its parent
+        new = _table([("a", -1, 1, "a"), ("b2", -1, 1, "b2")])
+        new.orphan_parents[1] = "b"
+        merged, new_ids, _ = merge(old, new)
+        assert list(zip(merged.ids, merged.depths)) == [
+            ("a", 1),
+            ("b", 2),
+            ("b1", 3),
+            ("b2", 3),
+        ]
+        assert merged.parents.tolist() == [-1, 0, 1, 1]
+        assert merged.orphan_parents == {}
+        assert new_ids == ["b2"]
+
+    def test_merge_applies_depth_limit(self) -> None:
+        old = _table([("a", -1, 1, "a"), ("a1", 0, 2, "a1")])
+        merged, _, _ = merge(old, _table([]), max_depth=1)
+        assert merged.ids == ["a"]
+
+
+class TestRefresh:
+    """Reddit2Text.refresh against a csv_relational or jsonl capture."""
+
+    @pytest.mark.parametrize(
+        "fmt,name",
+        [
+            ("csv_relational", "thread_comments.csv"),
+            ("jsonl", "thread.jsonl"),
+        ],
+    )
+    def test_refresh_from_capture(
+        self,
+        fake_submission: Any,
+        tmp_path: Path,
+        fmt: Any,
+        name: str,
+    ) -> None:
+        r = Reddit2Text(
+            client_id="id",
+            client_secret="secret",
+            user_agent="ua",
+            format=fmt,
+            jsonl_records="comment",
+            save_output_to=str(tmp_path / "thread.out"),
+        )
+        if fmt == "jsonl":
+            r.save_output_to = str(tmp_path / name)
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            r.textualize_post(URL)
+            snapshot = load_snapshot(str(tmp_path / name), "post")
+            assert snapshot.ids == ["c0", "c0_0", "c1"]
+
+            first, second = fake_submission._comments
+            hidden = first.replies.pop()  # now only in the snapshot
+            second.body = "Edited."
+            new = type(second)(
+                comment_id="c2",
+                author=None,
+                body="New comment.",
+                score=1,
+                replies=[],
+                parent=second._parent,
+            )
+            fake_submission._comments.append(new)
+
+            r.format = "txt"
+            result = r.refresh(URL, str(tmp_path / name))
+
+        assert result["new_comment_ids"] == ["c2"]
+        assert result["edited_comment_ids"] == ["c1"]
+        assert result["table"].ids == ["c0", "c0_0", "c1", "c2"]
+        assert hidden.body in result["output"]
+        assert "New comment." in result["output"]
+        assert (tmp_path / name).exists()
+
+    def test_refresh_reply_under_snapshot_only_comment(
+        self, fake_submission: Any
+    ) -> None:
+        r = Reddit2Text(
+            client_id="id", client_secret="secret", user_agent="ua"
+        )
+        snapshot = _table(
+            [("c0", -1, 1, "a"), ("c0_0", 0, 2, "b"), ("c1", -1, 1, "c")]
+        )
+        first, second = fake_submission._comments
+        first.replies.clear()  # c0_0 is known, so it is not fetched
+        reply = type(first)(
+            comment_id="c0_0_0",
+            author=None,
+            body="Late reply.",
+            score=1,
+            replies=[],
+            parent=first._parent,
+        )
+        reply.parent_id = "t1_c0_0"  # type: ignore[attr-defined]
+        fake_submission._comments.append(reply)
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            result = r.refresh(URL, snapshot)
+
+        table = result["table"]
+        assert list(zip(table.ids, table.depths)) == [
+            ("c0", 1),
+            ("c0_0", 2),
+            ("c0_0_0", 3),
+            ("c1", 1),
+        ]
+        assert result["new_comment_ids"] == ["c0_0_0"]
+
+    def test_refresh_matches_full_capture(
+        self, fake_submission: Any, tmp_path: Path
+    ) -> None:
+        r = Reddit2Text(
+            client_id="id",
+            client_secret="secret",
+            user_agent="ua",
+            format="csv_relational",
+            save_output_to=str(tmp_path / "thread.out"),
+        )
+        first, second = fake_submission._comments
+        Comment = type(first)
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            r.textualize_post(URL)
+        snapshot = load_snapshot(str(tmp_path / "thread_comments.csv"), "post")
+
+        # A new reply under c0 and a new top-level comment
+        first.replies.append(
+            Comment(
+                comment_id="c0_1",
+                author=None,
+                body="New reply.",
+                score=1,
+                replies=[],
+                parent=first._parent,
+            )
+        )
+        fake_submission._comments.append(
+            Comment(
+                comment_id="c2",
+                author=None,
+                body="New comment.",
+                score=1,
+                replies=[],
+                parent=second._parent,
+            )
+        )
+        full = Reddit2Text(
+            client_id="id", client_secret="secret", user_agent="ua"
+        )
+        with patch.object(full, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            expected = full.textualize_post(URL)
+
+        # Known comments stay behind their stubs in the fresh fetch
+        hidden_reply = first.replies.pop(0)
+        fake_submission._comments.remove(second)
+        r.format = "txt"
+        r.save_output_to = None
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            result = r.refresh(URL, snapshot)
+
+        assert hidden_reply.id in result["table"].ids
+        assert result["table"].ids == ["c0", "c0_0", "c0_1", "c1", "c2"]
+        assert result["output"] == expected
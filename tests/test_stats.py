@@ -0,0 +1,194 @@
+"""Tests for per-URL stats: phase timings and request accounting."""
+
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, List
+from unittest.mock import patch
+
+import pytest
+from prawcore.exceptions import TooManyRequests
+
+from reddit2text import metrics
+from reddit2text.main import Reddit2Text
+from reddit2text.models import ThreadStats
+from reddit2text.pool import ClientPool, PooledClient
+from reddit2text.ratelimit import CountingRetryStrategy, RateLimitScheduler
+
+URL = "https://reddit.com/r/fake/comments/post/title/"
+BAD = "https://reddit.com/r/fake/comments/bad/title/"
+
+
+def _r2t(events: List[ThreadStats], **kwargs: Any) -> Reddit2Text:
+    return Reddit2Text(
+        client_id="id",
+        client_secret="secret",
+        user_agent="ua",
+        on_stats=events.append,
+        **kwargs,
+    )
+
+
+class TestPhaseStats:
+    """Phase timings, sizes and errors per URL."""
+
+    @pytest.mark.parametrize("workers", [None, 2])
+    def test_one_event_per_url(
+        self, fake_submission: Any, tmp_path: Path, workers: Any
+    ) -> None:
+        events: List[ThreadStats] = []
+        r = _r2t(
+            events,
+            max_workers=workers,
+            save_output_to=str(tmp_path / "out.txt"),
+        )
+
+        def submission(url: str) -> Any:
+            if "bad" in url:
+                raise ValueError("boom")
+            return fake_submission
+
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.side_effect = submission
+            results = r.textualize_batch([URL, BAD])
+
+        assert [e["url"] for e in events] == [URL, BAD]
+        ok, failed = events
+        assert ok["error"] is None
+        assert ok["comments"] == 3
+        output = results[0]["output"]
+        assert isinstance(output, str)
+        assert ok["output_bytes"] == len(output.encode())
+        for key in ("fetch_s", "expand_s", "traverse_s", "format_s"):
+            assert ok[key] >= 0.0  # type: ignore[literal-required]
+        assert ok["write_s"] > 0.0
+        assert failed["error"] == "ValueError: boom"
+        assert failed["comments"] == 0
+
+    def test_multi_format_bytes(self, fake_submission: Any) -> None:
+        events: List[ThreadStats] = []
+        r = _r2t(events)
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            out = r.textualize_post(URL, formats=["txt", "json"])
+        assert isinstance(out, dict)
+        assert events[0]["output_bytes"] == sum(
+            len(v.encode()) for v in out.values()
+        )
+
+    def test_failure_reported_before_raising(self) -> None:
+        events: List[ThreadStats] = []
+        r = _r2t(events)
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.side_effect = ValueError("boom")
+            with pytest.raises(ValueError):
+                r.textualize_post(URL)
+        assert events[0]["error"] == "ValueError: boom"
+
+    def test_off_by_default(self, fake_submission: Any) -> None:
+        r = Reddit2Text(
+            client_id="id", client_secret="secret", user_agent="ua"
+        )
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            assert r._try_textualize_one(URL)[1] is None
+
+
+class TestRequestAccounting:
+    """HTTP counters per URL and totals per batch."""
+
+    def test_scheduler_counts_requests_bytes_and_waits(self) -> None:
+        scheduler = RateLimitScheduler()
+        stats = metrics.new("url")
+        response = SimpleNamespace(
+            headers={
+                "x-ratelimit-remaining": "0",
+                "x-ratelimit-reset": "0.05",
+            },
+            content=b"12345",
+        )
+        with metrics.collect(stats):
+            for _ in range(2):
+                scheduler.call(
+                    method="GET",
+                    request_function=lambda method, url, **kw: response,
+                    set_header_callback=dict,
+                    url="https://oauth.reddit.com/x",
+                )
+        assert stats["requests"] == 2
+        assert stats["response_bytes"] == 10
+        assert stats["rate_limit_sleeps"] == 1
+        assert stats["rate_limit_sleep_s"] > 0
+
+    def test_retries_counted(self) -> None:
+        stats = metrics.new("url")
+        with metrics.collect(stats):
+            retry = CountingRetryStrategy().consume_available_retry()
+        assert isinstance(retry, CountingRetryStrategy)
+        assert stats["retries"] == 1
+
+        r = Reddit2Text(
+            client_id="id", client_secret="secret", user_agent="ua"
+        )
+        core = r._praw_reddit._read_only_core
+        assert core._retry_strategy_class is CountingRetryStrategy
+
+    def test_pool_failover_is_a_retry(self) -> None:
+        class Session:
+            def __init__(self, error: Any = None) -> None:
+                self.error = error
+
+            def request(self, **kwargs: Any) -> Any:
+                if self.error:
+                    raise self.error
+                return "ok"
+
+        limited = TooManyRequests(
+            SimpleNamespace(status_code=429, headers={}, text="")
+        )
+        pool = ClientPool(
+            [
+                PooledClient("a", Session(limited), RateLimitScheduler()),
+                PooledClient("b", Session(), RateLimitScheduler()),
+            ]
+        )
+        stats = metrics.new("url")
+        with metrics.collect(stats):
+            pool.request(method="GET", path="x")
+        assert stats["retries"] == 1
+
+    def test_batch_totals_include_header_lookup(
+        self, fake_submission: Any
+    ) -> None:
+        events: List[ThreadStats] = []
+        r = _r2t(events, max_comment_depth=0)
+
+        def info(fullnames: List[str]) -> List[Any]:
+            metrics.add("requests")  # the bulk lookup's one request
+            return []
+
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.info.side_effect = info
+            mock_reddit.submission.return_value = fake_submission
+            r.textualize_batch([URL, URL])
+
+        assert [e["requests"] for e in events] == [0, 0]
+        assert r.batch_stats is not None
+        assert r.batch_stats["urls"] == 2
+        assert r.batch_stats["failed"] == 0
+        assert r.batch_stats["requests"] == 1
+
+    def test_collect_stats_without_callback(
+        self, fake_submission: Any
+    ) -> None:
+        r = Reddit2Text(
+            client_id="id",
+            client_secret="secret",
+            user_agent="ua",
+            collect_stats=True,
+        )
+        with patch.object(r, "_praw_reddit") as mock_reddit:
+            mock_reddit.submission.return_value = fake_submission
+            r.textualize_post([URL, URL])
+        assert r.batch_stats is not None
+        assert r.batch_stats["urls"] == 2
+        assert r.batch_stats["comments"] == 6